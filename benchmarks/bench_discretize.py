@@ -0,0 +1,108 @@
+"""Microbenchmark of `discretize()` and `discretize_runs()`.
+
+Times the discretization of one trial against the list-based loop
+(which `discretize()` still uses for trials with few responses),
+and checks that the dense output is bit-for-bit identical to it.
+Run from the repository root:
+
+    python benchmarks/bench_discretize.py
+"""
+
+from __future__ import annotations
+from typing import Callable, Any
+import itertools
+import operator
+import os
+import random
+import timeit
+
+import numpy as np
+
+from tdbear.analyzer.curves.tds_curve import discretize, discretize_runs
+from tdbear.analyzer.curves.tds_reader import read_records
+from tdbear.analyzer.labels import Labels
+
+DATASET: str = os.path.join(
+    os.path.dirname(__file__), "..", "tdbear", "analyzer", "dataset", "nanakoberry.yml"
+)
+RESOLUTIONS: tuple[int, ...] = (1000, 10000, 100000)
+
+
+def reference(
+    timing_data: dict[str, list[float]],
+    attr_nums: Labels,
+    duration: float,
+    resolution: int,
+) -> np.ndarray:
+    """The list-based loop, with times clipped to `[0, resolution]`."""
+
+    data: np.ndarray = np.zeros((len(attr_nums) + 1, resolution))
+
+    r = resolution / duration
+    times: list[tuple[int, int]] = [
+        (attr_nums[attr], min(max(round(t * r), 0), resolution))
+        for attr in timing_data
+        for t in timing_data[attr]
+    ]
+
+    times.sort(key=operator.itemgetter(1))
+    times.append((-1, resolution))
+
+    data[-1, : times[0][1]] = 1
+
+    for (a, b) in itertools.pairwise(times):
+        data[a[0], a[1] : b[1]] = 1
+
+    return data
+
+
+def synthetic(responses: int, seed: int = 0) -> dict[str, Any]:
+    rng: random.Random = random.Random(seed)
+    words: list[str] = [f"W{i}" for i in range(8)]
+    data: dict[str, list[float]] = {w: [] for w in words}
+
+    for _ in range(responses):
+        data[rng.choice(words)].append(round(rng.uniform(0.0, 30.0), 4))
+
+    return {"data": {k: sorted(v) for (k, v) in data.items() if v}, "duration": 30.0}
+
+
+def best(func: Callable[[], Any], number: int) -> float:
+    """Best time per call in microseconds."""
+
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    with open(DATASET, "r", encoding="UTF-8") as f:
+        cases: dict[str, list[dict[str, Any]]] = {
+            "nanakoberry": [*read_records(f)],
+            "synthetic (500 responses)": [synthetic(500, i) for i in range(20)],
+        }
+
+    for (name, records) in cases.items():
+        print(name)
+        print(f"{'resolution':>12}{'reference':>12}{'dense':>12}{'run-length':>12}")
+
+        for resolution in RESOLUTIONS:
+            args: list[tuple[Any, ...]] = [
+                (r["data"], Labels.get_instance(sorted(r["data"])), r["duration"])
+                for r in records
+            ]
+
+            for a in args:
+                assert np.array_equal(
+                    discretize(*a, resolution), reference(*a, resolution)
+                )
+
+            number: int = max(1, 200000 // resolution)
+            times: list[float] = [
+                best(lambda: [f(*a, resolution) for a in args], number) / len(args)
+                for f in (reference, discretize, discretize_runs)
+            ]
+
+            print(f"{resolution:>12}" + "".join(f"{t:>9.1f} us" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,23 @@
 """# `tdbear`
 """
 
-from . import analyzer
-from . import sampler
+from typing import Any, TYPE_CHECKING
+import importlib
+
 from . import _util
 
+if TYPE_CHECKING:
+    from . import analyzer
+    from . import sampler
+
+
 __all__ = ["analyzer", "sampler", "_util"]
+
+
+def __getattr__(name: str) -> Any:
+    # `analyzer` and `sampler` are imported on the first access,
+    # so that importing one of them does not load the other
+    if name in ("analyzer", "sampler"):
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 from .._util.typevars import T, U, Float64Array
 from .._util.console import Console
+from .._util.plotting import apply_fonts, pyplot
 
 
 __all__ = [
@@ -8,4 +9,6 @@ __all__ = [
     "Float64Array",
     #
     "Console",
+    "apply_fonts",
+    "pyplot",
 ]
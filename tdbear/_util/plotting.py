@@ -0,0 +1,39 @@
+from __future__ import annotations
+from types import ModuleType
+import functools
+
+
+@functools.cache
+def apply_fonts() -> None:
+    """# `tdbear._util.apply_fonts()`
+
+    Adds some font parameters to matplotlib on the first call,
+    for figures drawn with or without pyplot.
+    """
+
+    import matplotlib
+
+    matplotlib.rcParams["font.sans-serif"][0:0] = (
+        "Roboto",
+        "Noto Sans JP",
+        "Meiryo",
+        "Yu Gothic",
+        "MS Gothic",
+        "Hiragino Sans",
+    )
+
+
+@functools.cache
+def pyplot() -> ModuleType:
+    """# `tdbear._util.pyplot()`
+
+    Returns `matplotlib.pyplot`, importing it and adding some font
+    parameters to it on the first call, so that importing tdbear
+    does not load matplotlib.
+    """
+
+    import matplotlib.pyplot as plt
+
+    apply_fonts()
+
+    return plt
@@ -1,40 +1,63 @@
 """# `tdbear.analyzer`
 """
 
-import matplotlib.pyplot as __plt
-
 from ..analyzer.labels import Labels
-from ..analyzer.curves import Curve, TDSCurve, TDSContainer
+from ..analyzer.curves import (
+    Curve,
+    TDSCurve,
+    TDSAccumulator,
+    TDSContainer,
+    TDSTensor,
+    DtypePolicy,
+    meta_filter,
+)
 from ..analyzer.analysis_result import AnalysisResult
 from ..analyzer.pca import PCA
-from ..analyzer.module_funcs import load_file, load_dir, repl, show
+from ..analyzer.bootstrap import Bootstrap, BootstrapResult
+from ..analyzer.permutation_test import PermutationTest, PermutationTestResult
+from ..analyzer.distance import pairwise_distances
+from ..analyzer.rendering import render_figures
+from ..analyzer.cache import DiscretizationCache
+from ..analyzer.module_funcs import (
+    load_file,
+    load_dir,
+    iter_dir,
+    merge_dir,
+    repl,
+    show,
+)
 
 from . import dataset
 
 
-# add some font parameters to matplotlib
-__plt.rcParams["font.sans-serif"][0:0] = (
-    "Roboto",
-    "Noto Sans JP",
-    "Meiryo",
-    "Yu Gothic",
-    "MS Gothic",
-    "Hiragino Sans",
-)
-
 __all__ = [
     "Labels",
     #
     "Curve",
     "TDSCurve",
+    "TDSAccumulator",
     "TDSContainer",
+    "TDSTensor",
+    "DtypePolicy",
+    "meta_filter",
     #
     "AnalysisResult",
     #
     "PCA",
+    "Bootstrap",
+    "BootstrapResult",
+    "PermutationTest",
+    "PermutationTestResult",
+    #
+    "pairwise_distances",
+    "render_figures",
+    #
+    "DiscretizationCache",
     #
     "load_file",
     "load_dir",
+    "iter_dir",
+    "merge_dir",
     "repl",
     "show",
     #
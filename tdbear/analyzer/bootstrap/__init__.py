@@ -0,0 +1,4 @@
+from ..bootstrap.bootstrap import Bootstrap
+from ..bootstrap.bootstrap_result import BootstrapResult
+
+__all__ = ["Bootstrap", "BootstrapResult"]
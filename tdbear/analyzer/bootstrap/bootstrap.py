@@ -0,0 +1,197 @@
+from __future__ import annotations
+from typing import Iterable, Any
+import concurrent.futures
+import functools
+
+import numpy as np
+
+from ..._util import Float64Array
+from ..curves import TDSCurve, TDSTensor
+from ..curves.curve import normalize_columns
+from ..curves.stacking import stack_curves
+from ..curves.dtype_policy import DtypePolicy
+from .bootstrap_result import BootstrapResult
+
+
+# bytes of the merged replicates held in memory at a time
+_CHUNK_BYTES: int = 2**26
+
+# resample counts shared with the worker processes
+_shared_counts: np.ndarray | None = None
+
+
+class Bootstrap:
+    """# `tdbear.analyzer.Bootstrap`
+
+    Bootstrap confidence bands of merged TDS curves.
+    All resamples are drawn at once as a `(n_resamples, n_curves)` index
+    matrix, and the merged curves of all of them are computed as one
+    weighted sum over the stacked data, a block of time points at a time.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    dataset = ta.load_dir("./nanakoberry/**/")
+    result = ta.Bootstrap(10000, seed=0).fit(dataset, confidence=0.95)
+    result.draw()
+    ```
+    """
+
+    def __init__(
+        self,
+        n_resamples: int = 1000,
+        /,
+        *,
+        seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+        workers: int | None = None,
+    ):
+        """# `tdbear.analyzer.Bootstrap()`
+
+        ## Args
+        - `n_resamples` : Number of bootstrap resamples. Defaults to `1000`.
+        - `seed`        : Seed of the random number generator, or the
+                          `numpy.random.Generator` itself. The same seed
+                          gives the same resamples. Defaults to `None`.
+        - `workers`     : Number of worker processes computing blocks of
+                          time points in parallel. Everything runs in this
+                          process if this is `None` or `1`. The result does
+                          not depend on it. Defaults to `None`.
+        """
+
+        self.n_resamples: int = n_resamples
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.workers: int | None = workers
+
+    def fit(
+        self,
+        tds_curves: Iterable[TDSCurve],
+        *,
+        confidence: float = 0.95,
+        size: int | None = None,
+    ) -> BootstrapResult:
+        """# `tdbear.analyzer.Bootstrap.fit()`
+
+        Resamples the curves with replacement and merges each resample
+        like `TDSCurve.sum()`, i.e. weighting each curve by its number
+        of trials.
+
+        ## Args
+        - `tds_curves` : Curves with the same attributes and resolution,
+                         e.g. a `TDSContainer` or a `TDSTensor`.
+        - `confidence` : Confidence level of the percentile bands.
+                         Defaults to `0.95`.
+        - `size`       : Number of curves drawn in each resample.
+                         Defaults to the number of curves.
+
+        ## Returns
+        - `BootstrapResult` : The merged curve of all curves and the mean,
+                              the standard error and the percentile band
+                              of the resamples at each attribute and time.
+
+        ## Throws
+        - `ValueError` : Thrown when `tds_curves` is empty, `confidence`
+                         is not in range (0.0, 1.0), or the curves mix
+                         different attributes or resolutions.
+        """
+
+        curves: TDSTensor | list[TDSCurve] = (
+            tds_curves if isinstance(tds_curves, TDSTensor) else [*tds_curves]
+        )
+
+        if not len(curves):
+            raise ValueError("No curve to resample.")
+
+        if not (0.0 < confidence < 1.0):
+            raise ValueError("Confidence must be in range (0.0, 1.0).")
+
+        (stacked, weights) = stack_curves(curves)
+        (n, height, width) = stacked.shape
+
+        result = BootstrapResult()
+        result.tds_curves = (*curves,)
+        result.labels = result.tds_curves[0].attr_nums
+        result.estimate = (
+            curves.merge() if isinstance(curves, TDSTensor) else TDSCurve.sum(curves)
+        )
+        result.confidence = confidence
+        result.indices = self.rng.integers(
+            0, n, (self.n_resamples, n if size is None else size)
+        )
+
+        counts: np.ndarray = _counts(result.indices, n)
+        counts *= weights
+
+        bands: Float64Array = np.empty((4, height, width), DtypePolicy.accumulator)
+        step: int = max(1, _CHUNK_BYTES // (len(counts) * height * 8))
+        starts: range = range(0, width, step)
+        tiles: list[np.ndarray] = [stacked[..., t : t + step] for t in starts]
+        quantiles: tuple[float, float] = ((1 - confidence) / 2, (1 + confidence) / 2)
+
+        if self.workers is None or self.workers <= 1 or len(tiles) <= 1:
+            band = functools.partial(_bands, counts, quantiles)
+
+            for (t, b) in zip(starts, map(band, tiles)):
+                bands[..., t : t + step] = b
+
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                self.workers, initializer=_share, initargs=(counts,)
+            ) as executor:
+                results = executor.map(
+                    functools.partial(_bands, None, quantiles), tiles
+                )
+
+                for (t, b) in zip(starts, results):
+                    bands[..., t : t + step] = b
+
+        (result.mean, result.std, result.lower, result.upper) = bands
+
+        return result
+
+
+def _counts(indices: np.ndarray, n: int) -> np.ndarray:
+    """How many times each curve is drawn in each resample, `(B, n)`."""
+
+    counts: np.ndarray = np.empty((len(indices), n), DtypePolicy.accumulator)
+    step: int = max(1, 2**20 // max(1, indices.shape[1]))
+
+    for i in range(0, len(indices), step):
+        rows: np.ndarray = indices[i : i + step]
+        offsets: np.ndarray = np.arange(len(rows))[:, None] * n
+
+        counts[i : i + step] = np.bincount(
+            (rows + offsets).ravel(), minlength=len(rows) * n
+        ).reshape(len(rows), n)
+
+    return counts
+
+
+def _share(counts: np.ndarray) -> None:
+    global _shared_counts
+    _shared_counts = counts
+
+
+def _bands(
+    counts: np.ndarray | None,
+    quantiles: tuple[float, float],
+    tile: np.ndarray,
+) -> Float64Array:
+    """Mean, standard error, lower and upper bounds of a block of time points."""
+
+    if counts is None:
+        counts = _shared_counts  # type: ignore
+
+    (n, height, width) = tile.shape
+
+    # (height, width, B), so that the quantiles run over contiguous memory
+    merged: Any = tile.reshape(n, -1).astype(counts.dtype, copy=False).T @ counts.T
+    merged = merged.reshape(height, width, len(counts))
+
+    normalize_columns(merged, merged)
+
+    (lower, upper) = np.quantile(merged, quantiles, 2)
+
+    return np.stack(
+        [merged.mean(2), merged.std(2, ddof=min(1, len(counts) - 1)), lower, upper]
+    )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+
+import numpy as np
+
+from ..analysis_result import AnalysisResult
+from ..curves import TDSCurve
+from ..labels import Labels
+
+from ..._util import Float64Array, pyplot
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import matplotlib.figure as figure
+
+
+class BootstrapResult(AnalysisResult):
+    """# `tdbear.analyzer.BootstrapResult`
+
+    `mean`, `std`, `lower` and `upper` are `(n_attrs + 1, resolution)`
+    arrays in the same layout as `TDSCurve.data`, the last row being
+    the delay.
+    """
+
+    tds_curves: tuple[TDSCurve, ...]
+    labels: Labels
+    estimate: TDSCurve
+    confidence: float
+    indices: np.ndarray
+    mean: Float64Array
+    std: Float64Array
+    lower: Float64Array
+    upper: Float64Array
+
+    def draw(
+        self,
+        layout: list[list[list[str]]] | None = None,
+        time_denominator: float = 1.0,
+        proportion_denominator: float = 1.0,
+        show: bool = True,
+        band_args: dict[str, Any] = {},
+        curve_args: dict[str, Any] = {},
+        *,
+        fig: figure.Figure | None = None,
+    ) -> tuple[figure.Figure, list[list[plt.Axes]]]:
+        """# `tdbear.analyzer.BootstrapResult.draw()`
+
+        Draws the merged curve of all curves (`TDSCurve.draw()`)
+        and fills the percentile band around each attribute.
+        """
+
+        if layout is None:
+            layout = [[[*self.labels]]]
+
+        (fig, axes) = self.estimate.draw(
+            layout,
+            time_denominator,
+            proportion_denominator,
+            show=False,
+            curve_args=curve_args,
+            fig=fig,
+        )
+
+        time_ax: Float64Array = (
+            np.arange(1, self.estimate.resolution + 1)
+            / self.estimate.resolution
+            * time_denominator
+        )
+
+        for (row, row_axes) in zip(layout, axes):
+            for (column, ax) in zip(row, row_axes):
+                for (key, line) in zip(column, ax.get_lines()):
+                    ax.fill_between(
+                        time_ax,
+                        self.lower[self.labels[str(key)]] * proportion_denominator,
+                        self.upper[self.labels[str(key)]] * proportion_denominator,
+                        **{"color": line.get_color(), "alpha": 0.2, **band_args},
+                    )
+
+        if show:
+            pyplot().show()
+
+        return (fig, axes)
@@ -0,0 +1,3 @@
+from ..cache.discretization_cache import DiscretizationCache
+
+__all__ = ["DiscretizationCache"]
@@ -0,0 +1,440 @@
+from __future__ import annotations
+from typing import Callable, Any
+import functools
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from ..curves import TDSCurve, TDSContainer
+from ..curves.run_length import RunLength
+from ..curves.tds_curve import CurveData
+from ..curves.dtype_policy import DtypePolicy
+from ..curves.meta_table import Query, meta_filter
+from ..labels import Labels
+
+
+class DiscretizationCache:
+    """# `tdbear.analyzer.DiscretizationCache`
+
+    An on-disk cache of discretized TDS records.
+    Each entry holds all records of one file at one resolution,
+    and is invalidated when the modification time or the size
+    (or optionally the content) of the file changes. The least recently
+    used entries are evicted when the total size exceeds `max_bytes`.
+    The metadata of the records of each file are also kept apart,
+    so that queries (`where`) can skip files without reading them.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    cache = ta.DiscretizationCache(".tdbear_cache", max_bytes=2**28)
+    dataset = ta.load_dir("./nanakoberry/**/", cache=cache)
+    ```
+    """
+
+    def __init__(
+        self,
+        directory: str = ".tdbear_cache",
+        max_bytes: int = 2**30,
+        check_content: bool = False,
+    ):
+        """# `tdbear.analyzer.DiscretizationCache()`
+
+        ## Args
+        - `directory`     : Directory where the cache entries are stored.
+                            Defaults to `".tdbear_cache"`.
+        - `max_bytes`     : Maximum total size of the cache entries.
+                            Defaults to `2**30` (1 GiB).
+        - `check_content` : Set this `True` to validate entries by the hash
+                            of the file content in addition to the
+                            modification time and the size.
+                            Defaults to `False`.
+        """
+
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.check_content: bool = check_content
+
+        self.__size: int | None = None
+
+    def load(
+        self,
+        file_path: str,
+        resolution: int,
+        compact: bool = False,
+        dtype: DTypeLike | None = None,
+        where: Query | None = None,
+        lazy: bool = False,
+    ) -> TDSContainer | None:
+        """# `tdbear.analyzer.DiscretizationCache.load()`
+
+        Returns the cached records of the file,
+        or `None` if there is no valid entry.
+        Single trials are returned in the run-length encoded form
+        if `compact` is `True`, and their data is of `dtype`
+        (defaults to `DtypePolicy.trial`). Only the records whose
+        metadata match `where` (see `meta_filter()`) are returned
+        if it is given. If `lazy` is `True`, the data of each curve is
+        made from the cached one on the first access, as that of
+        a lazily loaded curve (see `TDSCurve.release()`).
+        """
+
+        if dtype is None:
+            dtype = DtypePolicy.trial
+
+        entry: str = self.__entry_path(file_path, resolution)
+
+        try:
+            with np.load(entry) as npz:
+                if not np.array_equal(npz["stamp"], self.__stamp(file_path)):
+                    raise ValueError("Cache entry is out of date.")
+
+                records: list[dict[str, Any]] = json.loads(str(npz["records"]))
+                data: list[np.ndarray | RunLength] = (
+                    _split_dense(npz["data"].astype(dtype, copy=False), records)
+                    if "data" in npz
+                    else _split_runs(
+                        npz["starts"],
+                        npz["rows"],
+                        npz["runs"],
+                        records,
+                        (resolution, dtype),
+                    )
+                )
+
+        except FileNotFoundError:
+            return None
+
+        except (OSError, ValueError, KeyError):
+            self.__remove(entry)
+            return None
+
+        # both files are used, so neither is evicted first
+        self.__touch(entry)
+        self.__touch(self.__meta_path(file_path))
+
+        predicate: Callable[[dict[str, list[Any]]], bool] = (
+            (lambda _: True) if where is None else meta_filter(where)
+        )
+
+        return TDSContainer(
+            TDSCurve(
+                Labels.get_instance(record["attrs"]),
+                record["durations"],
+                record["delays"],
+                (
+                    functools.partial(_curve_data, d, compact, True)
+                    if lazy
+                    else _curve_data(d, compact, False)
+                ),
+                record["meta"],
+                record["name"],
+            )
+            for (record, d) in zip(records, data)
+            if predicate(record["meta"])
+        )
+
+    def load_meta(self, file_path: str) -> list[dict[str, list[Any]]] | None:
+        """# `tdbear.analyzer.DiscretizationCache.load_meta()`
+
+        Returns the metadata of the records of the file,
+        or `None` if there is no valid entry. This lets queries skip
+        files without reading them.
+        """
+
+        entry: str = self.__meta_path(file_path)
+
+        try:
+            with open(entry, "r", encoding="UTF-8") as f:
+                content: dict[str, Any] = json.load(f)
+
+            if content["stamp"] != self.__stamp(file_path).tolist():
+                raise ValueError("Cache entry is out of date.")
+
+            self.__touch(entry)
+
+            return content["meta"]
+
+        except FileNotFoundError:
+            return None
+
+        except (OSError, ValueError, KeyError, TypeError):
+            self.__remove(entry)
+            return None
+
+    def store_meta(self, file_path: str, metas: list[dict[str, list[Any]]]) -> bool:
+        """# `tdbear.analyzer.DiscretizationCache.store_meta()`
+
+        Stores the metadata of the records of the file. Returns `False`
+        if JSON cannot represent them. `store()` calls this as well.
+        """
+
+        try:
+            text: str = json.dumps(
+                {"stamp": self.__stamp(file_path).tolist(), "meta": metas},
+                ensure_ascii=False,
+            )
+            if json.loads(text)["meta"] != metas:
+                return False
+        except (TypeError, ValueError):
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        entry: str = self.__meta_path(file_path)
+        replaced: int = _file_size(entry)
+        (fd, temp) = tempfile.mkstemp(".tmp", dir=self.directory)
+
+        try:
+            with os.fdopen(fd, "w", encoding="UTF-8") as f:
+                f.write(text)
+
+            os.replace(temp, entry)
+
+        except BaseException:
+            self.__remove(temp)
+            raise
+
+        self.__count(entry, replaced)
+
+        return True
+
+    def store(self, file_path: str, resolution: int, curves: TDSContainer) -> bool:
+        """# `tdbear.analyzer.DiscretizationCache.store()`
+
+        Stores the records of the file. Returns `False` if the records
+        cannot be cached (e.g. metadata that JSON cannot represent).
+        """
+
+        records: list[dict[str, Any]] = [
+            {
+                "attrs": [*curve.attr_nums],
+                "durations": curve.durations,
+                "delays": curve.delays,
+                "meta": curve.meta,
+                "name": curve.name,
+            }
+            for curve in curves
+        ]
+
+        try:
+            text: str = json.dumps(records, ensure_ascii=False)
+            if json.loads(text) != records:
+                return False
+        except (TypeError, ValueError):
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        entry: str = self.__entry_path(file_path, resolution)
+        replaced: int = _file_size(entry)
+        (fd, temp) = tempfile.mkstemp(".tmp", dir=self.directory)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                runs: list[RunLength | None] = [c.run_length() for c in curves]
+
+                if all(runs):
+                    # single trials only need the points where
+                    # the selected row changes
+                    np.savez(
+                        f,
+                        stamp=self.__stamp(file_path),
+                        records=np.array(text),
+                        starts=np.concatenate([r.starts for r in runs] or [[]]),
+                        rows=np.concatenate([r.rows for r in runs] or [[]]),
+                        runs=np.array([len(r.starts) for r in runs], np.int64),
+                    )
+
+                else:
+                    np.savez_compressed(
+                        f,
+                        stamp=self.__stamp(file_path),
+                        records=np.array(text),
+                        data=np.concatenate([c.data for c in curves]),
+                    )
+
+            os.replace(temp, entry)
+
+        except BaseException:
+            self.__remove(temp)
+            raise
+
+        self.__count(entry, replaced)
+        self.store_meta(file_path, [record["meta"] for record in records])
+
+        return True
+
+    def invalidate(self, file_path: str) -> None:
+        """# `tdbear.analyzer.DiscretizationCache.invalidate()`
+
+        Removes entries of the file at all resolutions.
+        """
+
+        prefix: str = self.__key(file_path)
+
+        for entry in self.__entries():
+            if entry.name.startswith(prefix):
+                self.__remove(entry.path)
+
+    def evict(self, max_bytes: int | None = None) -> None:
+        """# `tdbear.analyzer.DiscretizationCache.evict()`
+
+        Removes the least recently used entries until
+        the total size falls below `max_bytes`
+        (defaults to 90% of `self.max_bytes`).
+        """
+
+        limit: int = int(self.max_bytes * 0.9) if max_bytes is None else max_bytes
+        entries: list[tuple[float, int, str]] = []
+
+        for entry in self.__entries():
+            try:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                pass
+
+        size: int = sum(e[1] for e in entries)
+
+        for (_, entry_size, path) in sorted(entries):
+            if size <= limit:
+                break
+
+            self.__remove(path)
+            size -= entry_size
+
+        self.__size = size
+
+    def clear(self) -> None:
+        """# `tdbear.analyzer.DiscretizationCache.clear()`
+
+        Removes all entries.
+        """
+
+        self.evict(0)
+
+    def __entries(self) -> list[os.DirEntry[str]]:
+        try:
+            with os.scandir(self.directory) as it:
+                return [
+                    e
+                    for e in it
+                    if e.name.endswith((".npz", ".meta.json")) and e.is_file()
+                ]
+        except FileNotFoundError:
+            return []
+
+    def __count(self, entry: str, replaced: int) -> None:
+        """Adds a stored file, which replaced one of `replaced` bytes,
+        to the total size, and evicts entries if it is exceeded."""
+
+        if self.__size is None:
+            self.__size = self.__total_size()
+        else:
+            self.__size += _file_size(entry) - replaced
+
+        if self.__size > self.max_bytes:
+            self.evict()
+
+    def __total_size(self) -> int:
+        size: int = 0
+
+        for entry in self.__entries():
+            try:
+                size += entry.stat().st_size
+            except OSError:
+                pass
+
+        return size
+
+    def __entry_path(self, file_path: str, resolution: int) -> str:
+        return os.path.join(
+            self.directory, f"{self.__key(file_path)}-{int(resolution)}.npz"
+        )
+
+    def __meta_path(self, file_path: str) -> str:
+        return os.path.join(self.directory, f"{self.__key(file_path)}.meta.json")
+
+    def __stamp(self, file_path: str) -> np.ndarray:
+        stat = os.stat(file_path)
+        stamp: list[int] = [stat.st_mtime_ns, stat.st_size]
+
+        if self.check_content:
+            with open(file_path, "rb") as f:
+                digest: bytes = hashlib.sha1(f.read()).digest()
+
+            stamp += [int.from_bytes(digest[i : i + 4], "big") for i in (0, 4, 8)]
+
+        return np.array(stamp, np.int64)
+
+    @staticmethod
+    def __key(file_path: str) -> str:
+        path: str = os.path.abspath(file_path)
+        return hashlib.sha1(path.encode("UTF-8")).hexdigest()
+
+    @staticmethod
+    def __touch(path: str) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def __remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _curve_data(
+    data: np.ndarray | RunLength, compact: bool, copy: bool
+) -> CurveData:
+    """Data of a curve in the form `compact` asks for. Lazy curves get
+    a `copy` of dense data, so that `release()` drops their changes."""
+
+    if isinstance(data, RunLength):
+        return data if compact else data.dense()
+
+    runs: RunLength | None = RunLength.from_dense(data) if compact else None
+
+    if runs is not None:
+        return runs
+
+    return data.copy() if copy else data
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _split_dense(
+    data: np.ndarray, records: list[dict[str, Any]]
+) -> list[np.ndarray | RunLength]:
+    bounds: np.ndarray = np.cumsum([len(r["attrs"]) + 1 for r in records])
+    return np.split(data, bounds[:-1])
+
+
+def _split_runs(
+    starts: np.ndarray,
+    rows: np.ndarray,
+    runs: np.ndarray,
+    records: list[dict[str, Any]],
+    layout: tuple[int, DTypeLike],
+) -> list[np.ndarray | RunLength]:
+    bounds: np.ndarray = np.cumsum(runs)[:-1]
+    (resolution, dtype) = layout
+
+    return [
+        RunLength((len(r["attrs"]) + 1, resolution), s, w, dtype)
+        for (r, s, w) in zip(records, np.split(starts, bounds), np.split(rows, bounds))
+    ]
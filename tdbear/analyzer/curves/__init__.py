@@ -1,9 +1,19 @@
 from ..curves.curve import Curve
-from ..curves.tds_curve import TDSCurve
+from ..curves.tds_curve import TDSCurve, TDSAccumulator
 from ..curves.tds_container import TDSContainer
+from ..curves.tds_tensor import TDSTensor
+from ..curves.run_length import RunLength
+from ..curves.meta_table import MetaTable, meta_filter
+from ..curves.dtype_policy import DtypePolicy
 
 __all__ = [
     "Curve",
     "TDSCurve",
+    "TDSAccumulator",
     "TDSContainer",
+    "TDSTensor",
+    "RunLength",
+    "MetaTable",
+    "meta_filter",
+    "DtypePolicy",
 ]
@@ -1,12 +1,18 @@
 from __future__ import annotations
-from typing import Any, Callable, Iterator, Self
+from typing import Any, Callable, Iterable, Iterator, Self
 import abc
 import warnings
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from ..._util import T, Float64Array
 from ..labels import Labels
+from .dtype_policy import DtypePolicy
+from .smoothing import smooth_data
+from .resampling import resample_data
+from .relabeling import row_map, relabel_data
+from .time_query import time_columns, values_at
 
 
 class Curve(metaclass=abc.ABCMeta):
@@ -35,6 +41,12 @@ class Curve(metaclass=abc.ABCMeta):
     """
     name: str
 
+    """# `tdbear.analyzer.Curve.meta_version`
+    Incremented each time `set_meta()` or `set_meta_all()` of any curve
+    is called, so that indexes of metadata can tell they are stale.
+    """
+    meta_version: int = 0
+
     @property
     def attr_words(self) -> tuple[str, ...]:
         """# `tdbear.analyzer.Curve.attr_words`
@@ -57,7 +69,7 @@ class Curve(metaclass=abc.ABCMeta):
 
         Dominance duration for each attribute word.
         """
-        return self.data.sum(1) / self.resolution
+        return self.data.sum(1, DtypePolicy.accumulator) / self.resolution
 
     @property
     def normalized_delay(self) -> float:
@@ -118,26 +130,26 @@ class Curve(metaclass=abc.ABCMeta):
         self, normalized_time: float, include_delay: bool = False
     ) -> dict[str, float]:
 
-        attrs: list[str] = sorted(self.attr_nums, key=lambda i: self.attr_nums[i])
+        attrs: list[str] = [*self.attr_words, "(DELAY)"]
 
-        data: Float64Array
+        return dict(zip(attrs, self.at_times(normalized_time, include_delay)[0]))
 
-        if include_delay:
-            attrs = [*attrs, "(DELAY)"]
+    def at_times(
+        self, normalized_times: float | Iterable[float], include_delay: bool = False
+    ) -> Float64Array:
+        """# `tdbear.analyzer.Curve.at_times()`
 
-        if not (0.0 <= normalized_time <= 1.0):
-            raise ValueError("Normalized time must be " "in range [0.0, 1.0].")
+        `(n_times, n_attrs)` dominance proportions at each normalized time,
+        in the order of `attr_words`, with the delay as the last column if
+        `include_delay` is set. At the time `0.0`, only the delay is `1.0`.
 
-        time = int(round(normalized_time * self.resolution) - 1)
-
-        if time < 0:
-            data = np.zeros(len(attrs), np.float64)
-            data[-1] = 1.0
+        ## Throws
+        - `ValueError` : Thrown when a time is not in range `[0.0, 1.0]`.
+        """
 
-        else:
-            data = self.data[:, time]
+        (columns, before) = time_columns(normalized_times, self.resolution)
 
-        return dict(zip(attrs, data))
+        return values_at(self[columns], before, include_delay)
 
     def attr_durations(self, include_delay=True) -> dict[str, float]:
         attr = (*self.attr_words, "(DELAY)") if include_delay else self.attr_words
@@ -154,6 +166,7 @@ class Curve(metaclass=abc.ABCMeta):
             self.meta[k].insert(0, value)
         else:
             self.meta[k] = [value]
+        Curve.meta_version += 1
         return self
 
     def set_meta_all(self, key: str, value: list[Any] | None) -> Self:
@@ -164,6 +177,8 @@ class Curve(metaclass=abc.ABCMeta):
         else:
             self.meta[k] = value
 
+        Curve.meta_version += 1
+
         return self
 
     def get_meta(self, key: str) -> Any:
@@ -185,34 +200,70 @@ class Curve(metaclass=abc.ABCMeta):
             warnings.warn(f'No metadata found for "{key}".', Warning)
         return meta
 
-    def smooth(self, level: float = 0.01) -> Self:
-        weight: int = int(level * self.resolution)
-        edge: int = weight // 2
-        rows: int = len(self.data)
-        edged: Float64Array = np.concatenate(
-            [
-                np.tile(self.data[:, 0].reshape(rows, 1), edge),
-                self.data,
-                np.tile(self.data[:, -1].reshape(rows, 1), weight - edge - 1),
-            ],
-            1,
-        )
+    def smooth(
+        self,
+        level: float = 0.01,
+        dtype: DTypeLike | None = None,
+        *,
+        kernel: str = "moving",
+    ) -> Self:
+        """# `tdbear.analyzer.Curve.smooth()`
+
+        Smooths each row of the data in place with a kernel
+        `level * resolution` columns wide (see `smooth_data()`).
+        `kernel` is one of `"moving"` (the moving average, default),
+        `"triangular"` and `"gaussian"`.
+        """
 
-        self.data = np.array(
-            [np.convolve(row, [1 / weight] * weight, "valid") for row in edged]
-        )
+        self.data = smooth_data(self.data, int(level * self.resolution), kernel, dtype)
 
         return self
 
     def fix(self) -> Self:
-        np.divide(self.data, self.data.sum(0), self.data)
+        if np.issubdtype(self.data.dtype, np.inexact):
+            normalize_columns(self.data, self.data)
+        else:
+            self.data = normalize_columns(self.data).astype(DtypePolicy.curve)
+
         return self
 
-    def resample(self, resolution: int, phase: float = 1.0) -> Self:
-        width: int = self.resolution // resolution
-        self.data = self.data[
-            :, slice(min(int(width * phase), width - 1), self.resolution, width)
-        ]
+    def resample(
+        self,
+        resolution: int,
+        phase: float = 1.0,
+        *,
+        method: str = "stride",
+        dtype: DTypeLike | None = None,
+    ) -> Self:
+        """# `tdbear.analyzer.Curve.resample()`
+
+        Changes the resolution of the data in place (see `resample_data()`).
+        `method="mean"` preserves the area under each row and can also
+        increase the resolution; `"stride"` (default) keeps every
+        `self.resolution // resolution`-th column from `phase`.
+        """
+
+        self.data = resample_data(self.data, resolution, method, phase, dtype)
+        return self
+
+    def relabel(self, attr_nums: Labels, *, fold_into_delay: bool = False) -> Self:
+        """# `tdbear.analyzer.Curve.relabel()`
+
+        Changes the attributes of this curve to `attr_nums` in place.
+        The rows of the data are moved to the positions of their words
+        in `attr_nums`, and the rows of new words are filled with zeros.
+        The rows of words missing from `attr_nums` are dropped, or added
+        to the delay row if `fold_into_delay` is set (see `relabel_data()`).
+        """
+
+        if attr_nums != self.attr_nums:
+            self.data = relabel_data(
+                self.data,
+                row_map(self.attr_nums, attr_nums, fold_into_delay),
+                len(attr_nums) + 1,
+            )
+            self.attr_nums = attr_nums
+
         return self
 
     def save(
@@ -225,7 +276,7 @@ class Curve(metaclass=abc.ABCMeta):
     ) -> str:
 
         data: Float64Array = self.data if include_delay else self.data[:-1]
-        data = data.round(4)
+        data = data.astype(np.float64).round(4)
 
         if not file_name:
             file_name = self.name
@@ -249,3 +300,21 @@ class Curve(metaclass=abc.ABCMeta):
             f.write(result)
 
         return result
+
+
+def normalize_columns(
+    data: np.ndarray, out: np.ndarray | None = None, axis: int = 0
+) -> Float64Array:
+    """# `tdbear.analyzer.curves.normalize_columns()`
+
+    Divides each column of `data` by its sum over the rows (`axis`),
+    into `out` if it is given. Columns that sum to zero (where only
+    words dropped by `relabel_data()` were selected) are left zero.
+    """
+
+    total: Float64Array = data.sum(axis, DtypePolicy.accumulator, keepdims=True)
+
+    if out is None:
+        out = np.zeros(data.shape, DtypePolicy.accumulator)
+
+    return np.divide(data, total, out, where=total != 0.0, casting="same_kind")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import Callable, Any
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+
+# keys of the dtypes `DtypePolicy.set()` can change
+_KEYS: tuple[str, ...] = ("trial", "curve", "accumulator")
+
+
+class DtypePolicy:
+    """# `tdbear.analyzer.DtypePolicy`
+
+    dtypes of curve data. Lower precision trades accuracy for memory,
+    e.g. `bool` takes one eighth of the memory of `float64`.
+    Functions that take a `dtype` argument use these values when
+    it is `None`.
+
+    ## Examples
+    ```python
+    import numpy as np
+    import tdbear.analyzer as ta
+
+    ta.DtypePolicy.set("trial", np.bool_)("curve", np.float32)
+    ```
+    """
+
+    """dtype of the data of single trials (e.g. float64, float32, uint8, bool)"""
+    trial: DTypeLike = np.float64
+
+    """dtype of the data of merged and smoothed curves"""
+    curve: DTypeLike = np.float64
+
+    """dtype in which sums, normalizations and distances are accumulated"""
+    accumulator: DTypeLike = np.float64
+
+    @classmethod
+    def set(cls, key: str, value: Any) -> Callable:
+        """# `tdbear.analyzer.DtypePolicy.set()`
+
+        Sets the dtype of `key` and returns this function, so that
+        calls can be chained.
+
+        ## Throws
+        - `KeyError`  : Thrown when `key` is not `"trial"`, `"curve"`
+                        or `"accumulator"`.
+        - `TypeError` : Thrown when `value` is not a dtype.
+        """
+
+        if key not in _KEYS:
+            raise KeyError(key)
+
+        setattr(cls, key, np.dtype(value).type)
+
+        return cls.set
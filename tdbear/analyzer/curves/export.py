@@ -0,0 +1,239 @@
+from __future__ import annotations
+from typing import BinaryIO, Iterator, Mapping, Sequence, Any
+import os
+import json
+import functools
+import zipfile
+
+import numpy as np
+
+from .tds_curve import TDSCurve, check_operable
+from .dtype_policy import DtypePolicy
+
+
+FORMATS: tuple[str, ...] = ("long", "wide", "npz")
+
+# bytes of the data written to an npz file at a time
+_CHUNK_BYTES: int = 2**24
+
+
+def export_curves(
+    curves: Sequence[TDSCurve],
+    path: str,
+    format: str = "long",
+    meta: Mapping[str, Sequence[Any]] = {},
+    delimiter: str = "\t",
+    decimals: int = 4,
+) -> str:
+    """# `tdbear.analyzer.curves.export_curves()`
+
+    Writes `curves` into a single file at `path`, one curve at a time
+    so that the memory used does not grow with the number of curves.
+    `meta` holds a column of values for each metadata key.
+    See `TDSContainer.export()` for the formats.
+
+    ## Throws
+    - `ValueError` : Thrown when `format` is unknown, or when it is
+                     `"wide"` or `"npz"` and the attributes (or, for
+                     `"npz"`, the resolutions) of the curves differ.
+    """
+
+    if format not in FORMATS:
+        raise ValueError(f'Unknown format "{format}".')
+
+    if format != "long":
+        for c in curves:
+            if c.attr_nums != curves[0].attr_nums:
+                check_operable(curves[0], c)
+
+    if format == "npz":
+        _write_npz(curves, path)
+        return path
+
+    sep: bytes = delimiter.encode()
+    header: list[str] = ["CURVE", *meta, "TIME"]
+
+    if format == "long":
+        header += ["ATTRIBUTE", "VALUE"]
+    elif curves:
+        header += [*curves[0].attr_words, "DELAY"]
+
+    with open(path, "wb") as f:
+        f.write(delimiter.join(header).encode() + b"\n")
+
+        for (i, (curve, data)) in enumerate(_datas(curves)):
+            values: list[str] = [
+                "" if column[i] is None else str(column[i]) for column in meta.values()
+            ]
+            prefix: bytes = (delimiter.join([str(i), *values]) + delimiter).encode()
+            fields: np.ndarray = _fields(data, decimals)
+            times: np.ndarray = _times(data.shape[1])
+
+            if format == "wide":
+                cells: np.ndarray = np.empty(
+                    (data.shape[1], data.shape[0], len(sep) + fields.shape[2]),
+                    np.uint8,
+                )
+                cells[..., : len(sep)] = np.frombuffer(sep, np.uint8)
+                cells[..., len(sep) :] = fields.transpose(1, 0, 2)
+
+                f.write(_join(prefix, times, cells.reshape(len(cells), -1), b"\n"))
+                continue
+
+            for (row, attr) in enumerate([*curve.attr_words, "DELAY"]):
+                f.write(
+                    _join(prefix, times, sep + attr.encode() + sep, fields[row], b"\n")
+                )
+
+    return path
+
+
+def _datas(curves: Sequence[TDSCurve]) -> Iterator[tuple[TDSCurve, np.ndarray]]:
+    """Each curve with its data. Compact curves are expanded, and lazy
+    curves loaded, only while they are written."""
+
+    for c in curves:
+        loaded: bool = c.is_loaded
+
+        if c.is_compact:
+            yield (c, c.run_length().dense())  # type: ignore
+        else:
+            yield (c, c.data)
+
+        if not loaded:
+            c.release()
+
+
+def _fields(data: np.ndarray, decimals: int) -> np.ndarray:
+    """`(..., width)` bytes of the values of `data` formatted with
+    `decimals` digits, all with the same width."""
+
+    scale: int = 10**decimals
+    codes: np.ndarray = np.rint(np.multiply(data, scale, dtype=np.float64))
+
+    if decimals <= 6 and ((0 <= codes) & (codes <= scale)).all():
+        # proportions take one of `scale + 1` values once rounded
+        return _table(decimals)[codes.astype(np.intp)]
+
+    # other values are zero-padded to the width of the longest one
+    # (adding 0.0 turns negative zeros into zeros)
+    data = np.add(data, 0.0, dtype=np.float64)
+    text: np.ndarray = np.char.mod(f"%.{decimals}f", data)
+    width: int = int(np.char.str_len(text).max(initial=1))
+    padded: np.ndarray = np.char.encode(np.char.mod(f"%0{width}.{decimals}f", data))
+
+    return padded.view(np.uint8).reshape(*data.shape, -1)
+
+
+@functools.cache
+def _table(decimals: int) -> np.ndarray:
+    scale: int = 10**decimals
+
+    return _lines([f"{i / scale:.{decimals}f}" for i in range(scale + 1)])
+
+
+@functools.cache
+def _times(resolution: int) -> np.ndarray:
+    """Normalized time at the end of each column, as in `Curve.at_times()`."""
+
+    digits: int = len(str(resolution))
+
+    return _lines([f"{(i + 1) / resolution:.{digits}f}" for i in range(resolution)])
+
+
+def _lines(texts: list[str]) -> np.ndarray:
+    return np.frombuffer("".join(texts).encode(), np.uint8).reshape(len(texts), -1)
+
+
+def _join(*fields: bytes | np.ndarray) -> bytes:
+    """Concatenates the rows of `(rows, width)` byte arrays,
+    repeating `bytes` on every row."""
+
+    rows: int = next(len(f) for f in fields if isinstance(f, np.ndarray))
+    widths: list[int] = [
+        len(f) if isinstance(f, bytes) else f.shape[1] for f in fields
+    ]
+    lines: np.ndarray = np.empty((rows, sum(widths)), np.uint8)
+    start: int = 0
+
+    for (f, width) in zip(fields, widths):
+        lines[:, start : start + width] = (
+            np.frombuffer(f, np.uint8) if isinstance(f, bytes) else f
+        )
+        start += width
+
+    return lines.tobytes()
+
+
+def _write_npz(curves: Sequence[TDSCurve], path: str) -> None:
+    records: list[dict[str, Any]] = [
+        {
+            "attrs": [*curve.attr_nums],
+            "durations": curve.durations,
+            "delays": curve.delays,
+            "meta": curve.meta,
+            "name": curve.name,
+        }
+        for curve in curves
+    ]
+    text: str = json.dumps(records, ensure_ascii=False, default=str)
+
+    try:
+        with zipfile.ZipFile(path, "w", allowZip64=True) as zf:
+            with zf.open("records.npy", "w") as f:
+                np.lib.format.write_array(f, np.array(text))
+
+            if curves:
+                with zf.open("data.npy", "w", force_zip64=True) as f:
+                    _write_data(curves, f)
+
+    except BaseException:
+        # the resolutions are checked while the data are written
+        os.remove(path)
+        raise
+
+
+def _write_data(curves: Sequence[TDSCurve], f: BinaryIO) -> None:
+    """Writes the `(n_curves, n_attrs + 1, resolution)` array of the data
+    in the `.npy` format, one chunk of curves at a time."""
+
+    first: TDSCurve = curves[0]
+    loaded: bool = first.is_loaded
+    shape: tuple[int, int] = (len(first.attr_nums) + 1, first.resolution)
+
+    if not loaded:
+        first.release()
+
+    dtype: np.dtype = np.result_type(*map(_dtype, curves))
+    step: int = max(1, _CHUNK_BYTES // (shape[0] * shape[1] * dtype.itemsize))
+    chunk: list[np.ndarray] = []
+
+    np.lib.format.write_array_header_1_0(
+        f,
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (len(curves), *shape),
+        },
+    )
+
+    for (curve, data) in _datas(curves):
+        if data.shape != shape:
+            check_operable(first, curve)
+
+        chunk.append(data)
+
+        if len(chunk) == step:
+            f.write(np.stack(chunk).astype(dtype, copy=False).tobytes())
+            chunk.clear()
+
+    if chunk:
+        f.write(np.stack(chunk).astype(dtype, copy=False).tobytes())
+
+
+def _dtype(curve: TDSCurve) -> np.dtype:
+    # curves that are not loaded yet are discretized in `DtypePolicy.trial`
+    if curve.is_compact:
+        return curve.run_length().dtype  # type: ignore
+
+    return curve.data.dtype if curve.is_loaded else np.dtype(DtypePolicy.trial)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+from typing import Callable, Hashable, Iterable, Mapping, TypeAlias, Any
+import bisect
+import warnings
+
+from .curve import Curve
+from .tds_curve import TDSCurve
+
+
+Query: TypeAlias = "Mapping[str, Any] | Callable[[dict[str, list[Any]]], bool]"
+
+
+class MetaTable:
+    """# `tdbear.analyzer.curves.MetaTable`
+
+    Columnar metadata of a sequence of curves. A column holds the first
+    value of a metadata key for each curve (`None` if there is none), as
+    `Curve.get_meta()` returns it. Columns are read from the metadata of
+    the curves on each access, except those of the keys given to
+    `create_index()`, which are kept with a hash index from each value
+    to the positions of the curves that have it.
+    Appending and removing curves update the kept columns and the
+    indexes in place. `version` is the value of `Curve.meta_version`
+    when the table was built.
+    """
+
+    def __init__(self, curves: Iterable[TDSCurve] = (), keys: Iterable[str] = ()):
+        self.metas: list[dict[str, list[Any]]] = [curve.meta for curve in curves]
+        self.columns: dict[str, list[Any]] = {}
+        self.indexes: dict[str, dict[Hashable, list[int]]] = {}
+        self.version: int = Curve.meta_version
+
+        self.__orders: dict[str, tuple[list[Any], list[int]]] = {}
+
+        for key in keys:
+            self.create_index(key)
+
+    def __len__(self) -> int:
+        return len(self.metas)
+
+    def column(self, key: str) -> list[Any]:
+        """# `tdbear.analyzer.curves.MetaTable.column()`
+
+        Returns the column of `key`. Warns if some curves have no
+        value or multiple values for it.
+        """
+
+        key = key.strip().upper()
+
+        if key in self.columns:
+            return self.columns[key]
+
+        values: list[list[Any]] = [meta.get(key, []) for meta in self.metas]
+
+        if not all(values):
+            warnings.warn(f'No metadata found for "{key}".', Warning)
+
+        if any(len(v) > 1 for v in values):
+            warnings.warn(f'Metadata for "{key}" has multiple values.', Warning)
+
+        return [v[0] if v else None for v in values]
+
+    def create_index(self, key: str) -> dict[Hashable, list[int]]:
+        """# `tdbear.analyzer.curves.MetaTable.create_index()`
+
+        Builds the hash index of `key` if it does not exist yet.
+        """
+
+        key = key.strip().upper()
+
+        if key not in self.indexes:
+            self.columns[key] = self.column(key)
+            self.indexes[key] = MetaTable.group(self.columns[key])
+
+        return self.indexes[key]
+
+    @staticmethod
+    def group(column: list[Any]) -> dict[Hashable, list[int]]:
+        """# `tdbear.analyzer.curves.MetaTable.group()`
+
+        Positions of each value of `column`, in the order of appearance.
+        """
+
+        groups: dict[Hashable, list[int]] = {}
+
+        for (i, value) in enumerate(column):
+            groups.setdefault(value, []).append(i)
+
+        return groups
+
+    def equal(self, key: str, value: Any) -> list[int]:
+        """# `tdbear.analyzer.curves.MetaTable.equal()`
+
+        Positions of the curves whose value of `key` is `value`.
+        """
+
+        key = key.strip().upper()
+
+        if key in self.indexes:
+            return [*self.indexes[key].get(value, ())]
+
+        return [i for (i, v) in enumerate(self.column(key)) if v == value]
+
+    def one_of(self, key: str, values: Iterable[Any]) -> list[int]:
+        """# `tdbear.analyzer.curves.MetaTable.one_of()`
+
+        Positions of the curves whose value of `key` is one of `values`,
+        in ascending order. The column of an unindexed key is read once.
+        """
+
+        key = key.strip().upper()
+
+        if key in self.indexes:
+            index: dict[Hashable, list[int]] = self.indexes[key]
+            return sorted(i for value in {*values} for i in index.get(value, ()))
+
+        accepted: set[Any] = {*values}
+
+        return [i for (i, v) in enumerate(self.column(key)) if v in accepted]
+
+    def between(self, key: str, start: Any = None, stop: Any = None) -> list[int]:
+        """# `tdbear.analyzer.curves.MetaTable.between()`
+
+        Positions of the curves whose value of `key` is in `[start, stop)`,
+        in ascending order. `None` leaves the side open, and curves
+        without the value never match.
+        """
+
+        key = key.strip().upper()
+
+        if key in self.__orders:
+            (values, positions) = self.__orders[key]
+
+        else:
+            pairs: list[tuple[Any, int]] = sorted(
+                (v, i) for (i, v) in enumerate(self.column(key)) if v is not None
+            )
+            (values, positions) = ([p[0] for p in pairs], [p[1] for p in pairs])
+
+            # only the orders of indexed columns are kept
+            if key in self.indexes:
+                self.__orders[key] = (values, positions)
+
+        first: int = 0 if start is None else bisect.bisect_left(values, start)
+        last: int = len(values) if stop is None else bisect.bisect_left(values, stop)
+
+        return sorted(positions[first:last])
+
+    def append(self, curve: TDSCurve) -> None:
+        position: int = len(self.metas)
+        self.metas.append(curve.meta)
+        self.__orders.clear()
+
+        for (key, column) in self.columns.items():
+            value: list[Any] = curve.meta.get(key, [])
+            column.append(value[0] if value else None)
+
+            if key in self.indexes:
+                self.indexes[key].setdefault(column[-1], []).append(position)
+
+    def remove(self, position: int) -> None:
+        del self.metas[position]
+        self.__orders.clear()
+
+        for (key, column) in self.columns.items():
+            value: Any = column.pop(position)
+
+            if key not in self.indexes:
+                continue
+
+            index: dict[Hashable, list[int]] = self.indexes[key]
+            index[value].remove(position)
+
+            if not index[value]:
+                del index[value]
+
+            # positions after the removed one move forward by one
+            for positions in index.values():
+                first: int = bisect.bisect_right(positions, position)
+
+                for i in range(first, len(positions)):
+                    positions[i] -= 1
+
+
+def meta_filter(where: Query) -> Callable[[dict[str, list[Any]]], bool]:
+    """# `tdbear.analyzer.curves.meta_filter()`
+
+    Returns a predicate on the `meta` dict of a record.
+    `where` is either such a predicate itself, or a mapping from
+    metadata keys to conditions on their first values, with the same
+    meaning as the keyword arguments of `TDSContainer.select()`:
+    a value to equal, a `range` or a `slice` of values in `[start, stop)`,
+    or a `list`, `set` or `frozenset` of acceptable values.
+    """
+
+    if callable(where):
+        return where
+
+    conditions: list[tuple[str, Any]] = [
+        (key.strip().upper(), condition) for (key, condition) in where.items()
+    ]
+
+    def predicate(meta: dict[str, list[Any]]) -> bool:
+        for (key, condition) in conditions:
+            values: list[Any] = meta.get(key, [])
+            value: Any = values[0] if values else None
+
+            if isinstance(condition, (range, slice)):
+                if value is None or not (
+                    (condition.start is None or condition.start <= value)
+                    and (condition.stop is None or value < condition.stop)
+                ):
+                    return False
+
+            elif isinstance(condition, (list, set, frozenset)):
+                if value not in condition:
+                    return False
+
+            elif value != condition:
+                return False
+
+        return True
+
+    return predicate
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ..labels import Labels
+
+
+def row_map(
+    source: Labels, target: Labels, fold_into_delay: bool = False
+) -> np.ndarray:
+    """# `tdbear.analyzer.curves.row_map()`
+
+    Row of the data in the layout of `target` for each row of the data
+    in the layout of `source`, the last row being the delay. Attributes
+    missing from `target` are mapped to `-1` (dropped), or to the delay
+    row if `fold_into_delay` is set.
+    """
+
+    delay: int = len(target)
+    missing: int = delay if fold_into_delay else -1
+
+    return np.array(
+        [target[word] if word in target else missing for word in source] + [delay],
+        np.intp,
+    )
+
+
+def relabel_data(data: np.ndarray, rows: np.ndarray, height: int) -> np.ndarray:
+    """# `tdbear.analyzer.curves.relabel_data()`
+
+    Moves the rows (the second to last axis) of `data` to `rows`
+    (see `row_map()`) of a zero-filled array `height` rows high.
+    Rows mapped to `-1` are dropped, and rows mapped to the last row
+    are added up into it.
+    """
+
+    result: np.ndarray = np.zeros(
+        (*data.shape[:-2], height, data.shape[-1]), data.dtype
+    )
+    delay: np.ndarray = result[..., -1, :]
+
+    # row by row, slices are copied without the temporary arrays
+    # that fancy indexing of the whole stack would allocate
+    for (i, row) in enumerate(rows.tolist()):
+        if row < 0:
+            continue
+        elif row == height - 1:
+            np.add(delay, data[..., i, :], delay)
+        else:
+            result[..., row, :] = data[..., i, :]
+
+    return result
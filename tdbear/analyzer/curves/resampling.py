@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from ..._util import Float64Array
+from .dtype_policy import DtypePolicy
+
+
+METHODS: tuple[str, ...] = ("stride", "mean")
+
+
+def resample_data(
+    data: np.ndarray,
+    resolution: int,
+    method: str = "mean",
+    phase: float = 1.0,
+    dtype: DTypeLike | None = None,
+) -> Float64Array:
+    """# `tdbear.analyzer.curves.resample_data()`
+
+    Resamples `data` along its last axis to `resolution` columns.
+
+    `"mean"` treats each column as a constant over its interval of time
+    and averages it over the new intervals, so the area under each row
+    (e.g. `dominance_duration`) is preserved at any resolution.
+    It takes block means with `np.add.reduceat` when the new resolution
+    divides the current one, repeats columns when it is a multiple of it,
+    and integrates over fractional intervals otherwise.
+
+    `"stride"` keeps every `width`-th column, where `width` is
+    `current resolution // resolution`, starting at `phase` of the first
+    block, and returns a view unless `dtype` is given. It cannot upsample,
+    and the number of resulting columns is `resolution` only if it
+    divides the current one.
+    """
+
+    if method not in METHODS:
+        raise ValueError(f'Unknown method "{method}".')
+
+    if resolution < 1:
+        raise ValueError("Resolution must be positive.")
+
+    width: int = data.shape[-1]
+
+    if method == "stride":
+        step: int = width // resolution
+
+        if not step:
+            raise ValueError("Striding cannot increase the resolution.")
+
+        strided: np.ndarray = data[..., min(int(step * phase), step - 1) :: step]
+
+        return strided if dtype is None else strided.astype(dtype)
+
+    if dtype is None:
+        dtype = (
+            data.dtype if np.issubdtype(data.dtype, np.inexact) else DtypePolicy.curve
+        )
+
+    if resolution == width:
+        return data.astype(dtype)
+
+    if width % resolution == 0:
+        step = width // resolution
+        sums: Float64Array = np.add.reduceat(
+            data, np.arange(0, width, step), -1, DtypePolicy.accumulator
+        )
+
+        return np.multiply(sums, 1 / step, sums).astype(dtype, copy=False)
+
+    if resolution % width == 0:
+        return np.repeat(data.astype(dtype), resolution // width, -1)
+
+    # the integral of each row is piecewise linear, so its values at
+    # the new boundaries are interpolated from its cumulative sums
+    edges: Float64Array = np.arange(resolution + 1) * (width / resolution)
+    index: np.ndarray = np.minimum(edges.astype(np.intp), width - 1)
+    cumulative: Float64Array = np.cumsum(data, -1, DtypePolicy.accumulator)
+    cumulative = np.concatenate(
+        [np.zeros((*data.shape[:-1], 1), cumulative.dtype), cumulative], -1
+    )
+
+    integral: Float64Array = cumulative[..., index] + (edges - index) * data[
+        ..., index
+    ].astype(DtypePolicy.accumulator, copy=False)
+    means: Float64Array = np.diff(integral, axis=-1)
+
+    return np.multiply(means, resolution / width, means).astype(dtype, copy=False)
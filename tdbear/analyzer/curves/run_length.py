@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import Any
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from ..._util import Float64Array
+
+
+class RunLength:
+    """# `tdbear.analyzer.curves.RunLength`
+
+    Run-length encoded data of a single TDS trial.
+    Every column of the data of a single trial has exactly one `1.0`,
+    so only the columns where the selected row changes (`starts`)
+    and the selected rows (`rows`) are stored.
+    """
+
+    @staticmethod
+    def from_dense(data: Float64Array) -> RunLength | None:
+        """# `tdbear.analyzer.curves.RunLength.from_dense()`
+
+        Encodes a dense array. Returns `None` if any column of
+        the array is not one-hot.
+        """
+
+        if (
+            data.ndim != 2
+            or not data.shape[1]
+            or not ((data == 0.0) | (data == 1.0)).all()
+            or not (data.sum(0) == 1.0).all()
+        ):
+            return None
+
+        selected: np.ndarray = data.argmax(0)
+        starts: np.ndarray = np.flatnonzero(np.diff(selected, prepend=-1))
+
+        return RunLength(data.shape, starts, selected[starts], data.dtype)
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        starts: Any,
+        rows: Any,
+        dtype: DTypeLike = np.float64,
+    ):
+        self.shape: tuple[int, int] = (int(shape[0]), int(shape[1]))
+        self.starts: np.ndarray = np.asarray(starts, np.int32)
+        self.rows: np.ndarray = np.asarray(rows, np.int32)
+        self.dtype: np.dtype = np.dtype(dtype)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.starts, append=self.shape[1])
+
+    def selected(self) -> np.ndarray:
+        """# `tdbear.analyzer.curves.RunLength.selected()`
+
+        Index of the selected row for each column.
+        """
+        return np.repeat(self.rows, self.lengths)
+
+    def dense(self) -> Float64Array:
+        width: int = self.shape[1]
+        data: Float64Array = np.zeros(self.shape, self.dtype)
+
+        if len(self.starts) * 32 > width:
+            # many short runs: scatter into the flattened array at once
+            flat: np.ndarray = np.repeat(self.rows * np.intp(width), self.lengths)
+            data.reshape(-1)[flat + np.arange(width)] = 1
+
+        else:
+            # few long runs: filling slices writes nothing but the ones
+            starts: list[int] = self.starts.tolist()
+
+            for (row, start, end) in zip(self.rows.tolist(), starts, starts[1:]):
+                data[row, start:end] = 1
+
+            data[self.rows[-1], starts[-1] :] = 1
+
+        return data
+
+    def row(self, index: int) -> Float64Array:
+        return (self.selected() == range(self.shape[0])[index]).astype(self.dtype)
+
+    def columns(self, index: Any) -> Float64Array:
+        selected: np.ndarray = self.selected()[index]
+        rows: np.ndarray = np.arange(self.shape[0]).reshape(-1, *(1,) * selected.ndim)
+        return (rows == selected).astype(self.dtype)
+
+    def row_sums(self) -> Float64Array:
+        return np.bincount(self.rows, self.lengths, self.shape[0])
+
+    def add_to(self, out: Float64Array, weight: float = 1.0) -> Float64Array:
+        out[self.selected(), np.arange(self.shape[1])] += weight
+        return out
+
+    def relabel(self, rows: np.ndarray, height: int) -> RunLength | None:
+        """# `tdbear.analyzer.curves.RunLength.relabel()`
+
+        Same as `relabel_data()` for the encoded data: the selected rows
+        are mapped through `rows`, and runs that end up selecting the same
+        row are joined. Returns `None` if a selected row is dropped,
+        since the columns of the result are then no longer one-hot.
+        """
+
+        selected: np.ndarray = rows[self.rows]
+
+        if (selected < 0).any():
+            return None
+
+        changed: np.ndarray = np.diff(selected, prepend=-1) != 0
+
+        return RunLength(
+            (height, self.shape[1]),
+            self.starts[changed],
+            selected[changed],
+            self.dtype,
+        )
+
+    def __repr__(self) -> str:
+        return f"[RunLength of {len(self.starts)} runs, shape {self.shape}]"
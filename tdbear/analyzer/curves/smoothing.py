@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from ..._util import Float64Array
+from .dtype_policy import DtypePolicy
+
+
+# number of elements processed at a time
+_CHUNK: int = 2**16
+
+KERNELS: tuple[str, ...] = ("moving", "triangular", "gaussian")
+
+
+def smooth_data(
+    data: np.ndarray,
+    weight: int,
+    kernel: str = "moving",
+    dtype: DTypeLike | None = None,
+) -> Float64Array:
+    """# `tdbear.analyzer.curves.smooth_data()`
+
+    Smooths `data` along its last axis with a kernel `weight` columns
+    wide. Each row is padded with `weight // 2` copies of its first value
+    and `weight - weight // 2 - 1` copies of its last value, so that the
+    result has the same shape as `data`.
+
+    `"moving"` is the moving average, computed as differences of
+    cumulative sums in O(columns) whatever the width. `"triangular"` and
+    `"gaussian"` (a standard deviation of a sixth of the width) are
+    normalized kernels applied by FFT convolution.
+    Rows are processed in chunks, and `data` is not modified.
+    """
+
+    if kernel not in KERNELS:
+        raise ValueError(f'Unknown kernel "{kernel}".')
+
+    shape: tuple[int, ...] = data.shape
+    rows: np.ndarray = data.reshape(-1, shape[-1])
+    result: Float64Array = np.empty(
+        rows.shape, DtypePolicy.curve if dtype is None else dtype
+    )
+
+    if weight <= 1:
+        result[:] = rows
+        return result.reshape(shape)
+
+    width: int = shape[-1]
+    edge: int = weight // 2
+    step: int = max(1, _CHUNK // (width + weight))
+
+    # a leading zero column (for the cumulative sums),
+    # then the data padded with its edges
+    edged: Float64Array = np.zeros((step, width + weight), DtypePolicy.accumulator)
+    spectrum: np.ndarray | None = None
+
+    if kernel != "moving":
+        size: int = width + 2 * weight - 2
+        spectrum = np.fft.rfft(_kernel(kernel, weight), size)
+
+    for i in range(0, len(rows), step):
+        chunk: np.ndarray = rows[i : i + step]
+        e: Float64Array = edged[: len(chunk)]
+        out: Float64Array = result[i : i + step]
+
+        e[:, 1 : edge + 1] = chunk[:, :1]
+        e[:, edge + 1 : edge + 1 + width] = chunk
+        e[:, edge + 1 + width :] = chunk[:, -1:]
+
+        if spectrum is None:
+            np.cumsum(e, 1, out=e)
+            np.multiply(
+                np.subtract(e[:, weight:], e[:, :-weight]),
+                1 / weight,
+                out,
+                casting="unsafe",
+            )
+
+        else:
+            convolved: Float64Array = np.fft.irfft(
+                np.fft.rfft(e[:, 1:], size) * spectrum, size
+            )
+            out[:] = convolved[:, weight - 1 : weight - 1 + width]
+
+    return result.reshape(shape)
+
+
+def _kernel(kernel: str, weight: int) -> Float64Array:
+    if kernel == "triangular":
+        coefficients: Float64Array = np.bartlett(weight + 2)[1:-1]
+
+    else:
+        x: Float64Array = np.arange(weight) - (weight - 1) / 2
+        coefficients = np.exp(-0.5 * (x / (weight / 6)) ** 2)
+
+    return coefficients / coefficients.sum()
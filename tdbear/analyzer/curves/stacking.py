@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ..._util import Float64Array
+from .tds_curve import TDSCurve, check_operable
+from .tds_tensor import TDSTensor
+from .dtype_policy import DtypePolicy
+
+
+def stack_curves(
+    curves: TDSTensor | list[TDSCurve],
+) -> tuple[np.ndarray, Float64Array]:
+    """# `tdbear.analyzer.curves.stack_curves()`
+
+    The `(n_curves, n_attrs + 1, resolution)` array of the data of
+    `curves`, and the number of trials merged into each curve, which
+    weighs it when the curves are merged.
+
+    ## Throws
+    - `ValueError` : Thrown when the attributes or the resolutions
+                     of the curves differ.
+    """
+
+    if isinstance(curves, TDSTensor):
+        return (curves.data, np.ones(len(curves), DtypePolicy.accumulator))
+
+    for curve in curves:
+        check_operable(curves[0], curve)
+
+    return (
+        np.stack([curve.data for curve in curves]),
+        np.array([len(c.durations) for c in curves], DtypePolicy.accumulator),
+    )
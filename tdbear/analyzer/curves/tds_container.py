@@ -9,23 +9,51 @@ from typing import (
     Self,
     Any,
     overload,
+    TYPE_CHECKING,
 )
 import random
 import itertools
 import functools
 
-import yaml
-import matplotlib.pyplot as plt
-import matplotlib.figure as figure
+import numpy as np
+from numpy.typing import DTypeLike
 
-from .tds_curve import TDSCurve
+from ..._util import Float64Array, pyplot
+from ..labels import Labels
+from .curve import Curve
+from .tds_curve import TDSCurve, check_operable
+from .smoothing import smooth_data
+from .resampling import resample_data
+from .relabeling import row_map, relabel_data
+from .run_length import RunLength
+from .time_query import time_columns, values_at
+from .export import export_curves
+from .tds_reader import read_records
+from .meta_table import MetaTable, Query, meta_filter
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import matplotlib.figure as figure
+
+    from .tds_tensor import TDSTensor
 
 
 class TDSContainer(list[TDSCurve]):
     """# `tdbear.analyzer.TDSContainer`"""
 
+    # columnar metadata, built on the first metadata lookup by key
+    __table: MetaTable | None = None
+    __index_keys: tuple[str, ...] = ()
+
     @staticmethod
-    def from_yaml(yml: str | TextIOWrapper, resolution: int = 1000) -> TDSContainer:
+    def from_yaml(
+        yml: str | TextIOWrapper,
+        resolution: int = 1000,
+        lazy: bool = False,
+        compact: bool = False,
+        dtype: DTypeLike | None = None,
+        where: Query | None = None,
+    ) -> TDSContainer:
         """# `tdbear.analyzer.TDSContainer.from_yaml()`
 
         Creates a new `TDSContainer` instance from a YAML string.
@@ -36,6 +64,18 @@ class TDSContainer(list[TDSCurve]):
         - `yml`        : YAML string
         - `resolution` : Number of discretized interval of the entire
                          duration (start to stop). Defaults to `1000`.
+        - `lazy`       : Set this `True` to discretize each curve on
+                         the first access to its data. Defaults to `False`.
+        - `compact`    : Set this `True` to store the data of each curve in
+                         the run-length encoded form. Defaults to `False`.
+        - `dtype`      : dtype of the data. Defaults to `DtypePolicy.trial`.
+        - `where`      : Conditions on the metadata of the records
+                         (see `meta_filter()`). Records that do not match
+                         are dropped right after parsing, without being
+                         discretized. Defaults to `None`.
+
+        Unless `lazy` or `compact` is set, records sharing the same
+        attributes are discretized at once (see `TDSCurve.from_dicts()`).
 
         ## Returns
         - `TDSContainer` : A list-like object that contains multiple
@@ -55,10 +95,43 @@ class TDSContainer(list[TDSCurve]):
         ```
         """
 
-        records = yaml.safe_load_all(yml)
+        return TDSContainer.from_records(
+            read_records(yml), resolution, lazy, compact, dtype, where
+        )
+
+    @staticmethod
+    def from_records(
+        records: Iterable[dict[str, Any]],
+        resolution: int = 1000,
+        lazy: bool = False,
+        compact: bool = False,
+        dtype: DTypeLike | None = None,
+        where: Query | None = None,
+    ) -> TDSContainer:
+        """# `tdbear.analyzer.TDSContainer.from_records()`
+
+        Same as `TDSContainer.from_yaml()`, but takes records that are
+        already parsed (e.g. by `yaml.safe_load_all()`).
+        """
+
+        if where is not None:
+            predicate: Callable[[dict[str, list[Any]]], bool] = meta_filter(where)
+            records = (r for r in records if predicate(r["meta"]))
+
+        if not (lazy or compact):
+            return TDSContainer(TDSCurve.from_dicts(records, resolution, dtype))
 
         return TDSContainer(
-            map(functools.partial(TDSCurve.from_dict, resolution=resolution), records)
+            map(
+                functools.partial(
+                    TDSCurve.from_dict,
+                    resolution=resolution,
+                    lazy=lazy,
+                    compact=compact,
+                    dtype=dtype,
+                ),
+                records,
+            )
         )
 
     def __or__(self, other: Iterable[TDSCurve], /) -> Self:
@@ -141,6 +214,62 @@ class TDSContainer(list[TDSCurve]):
 
     def __setitem__(self, index, value, /):
         super().__setitem__(index, value)
+        self.__table = None
+
+    def __delitem__(self, index: SupportsIndex | slice, /) -> None:
+        if self.__table is not None and not isinstance(index, slice):
+            position: int = range(len(self))[index]
+            super().__delitem__(position)
+            self.__table.remove(position)
+        else:
+            super().__delitem__(index)
+            self.__table = None
+
+    def __iadd__(self, other: Iterable[TDSCurve], /) -> Self:
+        self.extend(other)
+        return self
+
+    def __imul__(self, other: SupportsIndex, /) -> Self:
+        super().__imul__(other)
+        self.__table = None
+        return self
+
+    def append(self, curve: TDSCurve, /) -> None:
+        super().append(curve)
+
+        if self.__table is not None:
+            self.__table.append(curve)
+
+    def extend(self, curves: Iterable[TDSCurve], /) -> None:
+        if self.__table is None:
+            return super().extend(curves)
+
+        for curve in curves:
+            self.append(curve)
+
+    def insert(self, index: SupportsIndex, curve: TDSCurve, /) -> None:
+        super().insert(index, curve)
+        self.__table = None
+
+    def remove(self, curve: TDSCurve, /) -> None:
+        del self[self.index(curve)]
+
+    def pop(self, index: SupportsIndex = -1, /) -> TDSCurve:
+        curve: TDSCurve = self[index]
+        del self[index]
+        return curve
+
+    def clear(self, /) -> None:
+        super().clear()
+        self.__table = None
+
+    def sort(self, /, *, key: Callable[[TDSCurve], Any] | None = None, reverse=False):
+        super().sort(key=key, reverse=reverse)  # type: ignore
+        self.__table = None
+
+    def reverse(self, /) -> None:
+        super().reverse()
+        self.__table = None
 
     def __repr__(self, /) -> str:
         n: int = self @ abs
@@ -161,6 +290,101 @@ class TDSContainer(list[TDSCurve]):
     def filter(self, func: Callable[[TDSCurve], bool]) -> Self:
         return TDSContainer(filter(func, self))
 
+    def create_index(self, *keys: str) -> Self:
+        """# `tdbear.analyzer.TDSContainer.create_index()`
+
+        Builds hash indexes on metadata keys, so that `select()` and
+        `group_by()` by those keys become lookups. Indexes are kept up
+        to date by `append()`, `extend()`, `+=`, `remove()`, `pop()` and
+        `del`; other modifications, including `set_meta()` and
+        `set_meta_all()` of any curve, rebuild them on the next lookup.
+        Call `reindex()` after changing the `meta` dict of the curves
+        directly. Keys without an index are always read from the
+        metadata of the curves.
+
+        ## Examples
+        ```python
+        import tdbear.analyzer as ta
+
+        dataset = ta.load_dir("./nanakoberry/**/").create_index("ASSESSOR")
+        assessor = dataset.select(ASSESSOR="PA")
+        ```
+        """
+
+        keys = tuple(key.strip().upper() for key in keys)
+        self.__index_keys = (*self.__index_keys, *keys)
+
+        for key in keys:
+            self.__meta_table().create_index(key)
+
+        return self
+
+    def reindex(self) -> Self:
+        """# `tdbear.analyzer.TDSContainer.reindex()`
+
+        Drops the columnar metadata and the indexes,
+        which are rebuilt on the next lookup.
+        """
+
+        self.__table = None
+
+        return self
+
+    def select(self, **conditions: Any) -> Self:
+        """# `tdbear.analyzer.TDSContainer.select()`
+
+        Returns the curves whose metadata match all conditions, in the
+        order of this container. Each keyword is a metadata key, and
+        its value is either
+        - a value the first metadata value must equal,
+        - a `range` or a `slice` of values in `[start, stop)`
+          (`None` leaves a side open), or
+        - a `list`, `set` or `frozenset` of acceptable values.
+
+        ## Examples
+        ```python
+        import tdbear.analyzer as ta
+
+        dataset = ta.load_dir("./nanakoberry/**/")
+        selected = dataset.select(PRODUCT="strawberry", COUNT=slice(2, None))
+        ```
+        """
+
+        table: MetaTable = self.__meta_table()
+        positions: set[int] | None = None
+
+        for (key, condition) in conditions.items():
+            matched: list[int]
+
+            if isinstance(condition, (range, slice)):
+                matched = table.between(key, condition.start, condition.stop)
+
+            elif isinstance(condition, (list, set, frozenset)):
+                matched = table.one_of(key, condition)
+
+            else:
+                matched = table.equal(key, condition)
+
+            positions = {*matched} if positions is None else positions & {*matched}
+
+        if positions is None:
+            positions = {*range(len(self))}
+
+        obj: TDSContainer = TDSContainer(map([*self].__getitem__, sorted(positions)))
+        obj.__index_keys = self.__index_keys
+
+        return obj
+
+    def __meta_table(self) -> MetaTable:
+        if (
+            self.__table is None
+            or len(self.__table) != len(self)
+            or self.__table.version != Curve.meta_version
+        ):
+            self.__table = MetaTable(self, self.__index_keys)
+
+        return self.__table
+
     def group_by(
         self, func: str | Callable[[TDSCurve], Hashable]
     ) -> dict[Hashable, Self]:
@@ -169,11 +393,20 @@ class TDSContainer(list[TDSCurve]):
         group_func: Callable[[TDSCurve], Hashable]
 
         if isinstance(func, str):
+            table: MetaTable = self.__meta_table()
+            index: dict[Hashable, list[int]] = (
+                table.indexes[func.strip().upper()]
+                if func.strip().upper() in table.indexes
+                else MetaTable.group(table.column(func))
+            )
 
-            def _group_func(x: TDSCurve):
-                return x.get_meta(func)
+            curves: list[TDSCurve] = [*self]
 
-            group_func = _group_func
+            for (key, positions) in index.items():
+                result[key] = TDSContainer(map(curves.__getitem__, positions))
+                result[key].__index_keys = self.__index_keys
+
+            return result
 
         else:
             group_func = func
@@ -190,24 +423,20 @@ class TDSContainer(list[TDSCurve]):
 
     def order_by(self, func: str | Callable[[TDSCurve], Any], desc=False) -> Self:
 
-        order_func: Callable[[TDSCurve], Any]
-
         if isinstance(func, str):
-
-            def _order_func(x: TDSCurve):
-                return x.get_meta(func)
-
-            order_func = _order_func
+            column: list[Any] = self.__meta_table().column(func)
+            order: list[int] = sorted(
+                range(len(self)), key=column.__getitem__, reverse=desc
+            )
+            self[:] = [*map([*self].__getitem__, order)]
 
         else:
-            order_func = func
-
-        self.sort(key=order_func, reverse=desc)
+            self.sort(key=func, reverse=desc)
 
         return self
 
     def get_meta(self, key: str) -> list[Any]:
-        return self >> (lambda e: TDSCurve.get_meta(e, key))
+        return [*self.__meta_table().column(key)]
 
     def get_meta_all(self, key: str) -> list[list[Any]]:
         return self >> (lambda e: TDSCurve.get_meta_all(e, key))
@@ -216,14 +445,323 @@ class TDSContainer(list[TDSCurve]):
         for curve in self:
             curve.set_meta(key, value)
 
+        self.__table = None
+
         return self
 
     def set_meta_all(self, key: str, value: list[Any] | None) -> Self:
         for curve in self:
             curve.set_meta_all(key, value)
 
+        self.__table = None
+
         return self
 
+    def to_tensor(self) -> TDSTensor:
+        """# `tdbear.analyzer.TDSContainer.to_tensor()`
+
+        Stacks the curves into a `TDSTensor`.
+        See `TDSTensor()` for the requirements.
+        """
+
+        from .tds_tensor import TDSTensor
+
+        return TDSTensor(self)
+
+    def smooth(
+        self,
+        level: float = 0.01,
+        dtype: DTypeLike | None = None,
+        *,
+        kernel: str = "moving",
+    ) -> Self:
+        """# `tdbear.analyzer.TDSContainer.smooth()`
+
+        Applies `Curve.smooth()` to all curves, stacking those of the same
+        shape so that each shape is smoothed in one call along the time
+        axis. Returns a new `TDSContainer` of new curves; this object and
+        the curves it contains are not modified.
+        """
+
+        return self.__derive(
+            lambda block: smooth_data(
+                block, int(level * block.shape[-1]), kernel, dtype
+            )
+        )
+
+    def resample(
+        self,
+        resolution: int,
+        phase: float = 1.0,
+        *,
+        method: str = "stride",
+        dtype: DTypeLike | None = None,
+    ) -> Self:
+        """# `tdbear.analyzer.TDSContainer.resample()`
+
+        Applies `Curve.resample()` to all curves, stacking those of the
+        same shape so that each shape is resampled in one call.
+        As in `Curve.resample()`, `method` defaults to `"stride"`;
+        `"mean"` preserves the area under each row. Returns a new
+        `TDSContainer` of new curves; this object and the curves it
+        contains are not modified.
+
+        ## Examples
+        ```python
+        import tdbear.analyzer as ta
+
+        dataset = ta.load_dir("./nanakoberry/**/", resolution=1000)
+        coarse = dataset.resample(100)
+        area = dataset.resample(100, method="mean")
+        ```
+        """
+
+        return self.__derive(
+            lambda block: resample_data(block, resolution, method, phase, dtype)
+        )
+
+    def harmonize(
+        self,
+        how: str = "union",
+        *,
+        attr_nums: Iterable[str] | None = None,
+        fold_into_delay: bool = False,
+    ) -> Self:
+        """# `tdbear.analyzer.TDSContainer.harmonize()`
+
+        Unifies the attributes of the curves, so that curves of sessions
+        with different attribute words can be merged and compared.
+        The rows of the data are moved through one index map for each set
+        of attributes (see `Curve.relabel()`): words a curve lacks are
+        filled with zeros, and words missing from the result are dropped.
+        Compact curves stay compact unless a dropped word is selected.
+        Returns a new `TDSContainer`; curves that already have the
+        resulting attributes are contained as they are, and the others
+        are replaced by new curves.
+
+        ## Args
+        - `how`             : `"union"` (default) to keep the words of any
+                              curve, or `"intersection"` to keep the words
+                              of all curves.
+        - `attr_nums`       : Attribute words of the result. `how` is
+                              ignored if this is given.
+        - `fold_into_delay` : Set this `True` to add the words missing
+                              from the result to the delay instead of
+                              dropping them, so that every column keeps
+                              its sum. Defaults to `False`.
+
+        ## Throws
+        - `ValueError` : Thrown when `how` is unknown.
+
+        ## Examples
+        ```python
+        import tdbear.analyzer as ta
+
+        dataset = ta.load_dir("./nanakoberry/**/").harmonize()
+        merged = dataset.merge()
+        ```
+        """
+
+        target: Labels
+
+        if attr_nums is not None:
+            target = Labels.get_instance(attr_nums)
+
+        elif how in ("union", "intersection"):
+            labels: dict[int, Labels] = {id(c.attr_nums): c.attr_nums for c in self}
+            target = getattr(Labels, how)(*labels.values())
+
+        else:
+            raise ValueError(f'Unknown method "{how}".')
+
+        curves: list[TDSCurve] = []
+        row_maps: dict[int, np.ndarray] = {}
+        height: int = len(target) + 1
+
+        for c in self:
+            if c.attr_nums == target:
+                curves.append(c)
+                continue
+
+            if id(c.attr_nums) not in row_maps:
+                row_maps[id(c.attr_nums)] = row_map(
+                    c.attr_nums, target, fold_into_delay
+                )
+
+            rows: np.ndarray = row_maps[id(c.attr_nums)]
+            runs: RunLength | None = c.run_length() if c.is_compact else None
+
+            if runs is not None:
+                runs = runs.relabel(rows, height)
+
+            curves.append(
+                self.__copy(
+                    c, relabel_data(c.data, rows, height) if runs is None else runs
+                )
+            )
+            curves[-1].attr_nums = target
+
+        return TDSContainer(curves)
+
+    @staticmethod
+    def __copy(curve: TDSCurve, data: Any) -> TDSCurve:
+        return TDSCurve(
+            curve.attr_nums,
+            [*curve.durations],
+            [*curve.delays],
+            data,
+            {key: [*value] for (key, value) in curve.meta.items()},
+            curve.name,
+        )
+
+    def __derive(self, func: Callable[[np.ndarray], np.ndarray]) -> Self:
+        """New curves whose data are `func` of a stack of the data
+        of the curves of each shape.
+        """
+
+        datas: list[Float64Array] = [curve.data for curve in self]
+        groups: dict[tuple[int, ...], list[int]] = {}
+        curves: list[TDSCurve] = [*self]
+
+        for (i, data) in enumerate(datas):
+            groups.setdefault(data.shape, []).append(i)
+
+        for positions in groups.values():
+            block: np.ndarray = func(np.stack([datas[i] for i in positions]))
+
+            for (i, data) in zip(positions, block):
+                curves[i] = self.__copy(curves[i], data)
+
+        return TDSContainer(curves)
+
+    def at_times(
+        self, normalized_times: float | Iterable[float], include_delay: bool = False
+    ) -> tuple[Float64Array, Labels]:
+        """# `tdbear.analyzer.TDSContainer.at_times()`
+
+        Dominance proportions of all curves at each normalized time
+        (see `Curve.at_times()`). The columns of each time are computed
+        once and taken from every curve by one indexing operation,
+        compact curves included.
+
+        ## Args
+        - `normalized_times` : Times in range `[0.0, 1.0]`.
+        - `include_delay`    : Set this `True` to add the delay as the last
+                               attribute. Defaults to `False`.
+
+        ## Returns
+        - `Float64Array` : `(n_curves, n_times, n_attrs)` array.
+        - `Labels`       : Attributes of the last axis, without the delay.
+
+        ## Throws
+        - `ValueError` : Thrown when the container is empty, a time is not
+                         in range `[0.0, 1.0]`, or the attributes or the
+                         resolutions of the curves differ.
+
+        ## Examples
+        ```python
+        import numpy as np
+        import tdbear.analyzer as ta
+
+        dataset = ta.load_dir("./nanakoberry/**/")
+        (values, attr_nums) = dataset.at_times(np.linspace(0, 1, 101))
+        ```
+        """
+
+        if not self:
+            raise ValueError("No curve to query.")
+
+        first: TDSCurve = self[0]
+        formats: dict[tuple[int, int], TDSCurve] = {
+            (id(c.attr_nums), c.resolution): c for c in self
+        }
+
+        for elem in formats.values():
+            check_operable(first, elem)
+
+        (columns, before) = time_columns(normalized_times, first.resolution)
+
+        return (
+            values_at(np.stack([c[columns] for c in self]), before, include_delay),
+            first.attr_nums,
+        )
+
+    def export(
+        self,
+        path: str,
+        format: str = "long",
+        *,
+        meta_keys: Iterable[str] | None = None,
+        delimiter: str = "\t",
+        decimals: int = 4,
+    ) -> str:
+        """# `tdbear.analyzer.TDSContainer.export()`
+
+        Writes all curves into a single file, one curve at a time, so
+        that the memory used does not grow with the number of curves.
+        Text formats are written through a table of the formatted values,
+        as a few array operations per curve; values are written with
+        `decimals` digits (values outside `[0.0, 1.0]` are zero-padded to
+        a common width). Each row starts with the position of the curve
+        (`CURVE`), the first value of each metadata key and the normalized
+        time at the end of the column (`TIME`, see `Curve.at_times()`).
+
+        - `"long"` : One row per curve, attribute and time, followed by
+                     `ATTRIBUTE` and `VALUE`. The last attribute of each
+                     curve is `DELAY`.
+        - `"wide"` : One row per curve and time, followed by a column
+                     for each attribute and `DELAY`.
+        - `"npz"`  : A NumPy `.npz` file of the `(n_curves, n_attrs + 1,
+                     resolution)` array (`data`) and the attributes,
+                     durations, delays, metadata and names of the curves
+                     as a JSON string (`records`). `meta_keys`,
+                     `delimiter` and `decimals` are ignored.
+
+        ## Args
+        - `path`      : Path of the file.
+        - `format`    : `"long"` (default), `"wide"` or `"npz"`.
+        - `meta_keys` : Metadata keys written as columns. Defaults to
+                        all keys of the curves, in the order they appear.
+        - `delimiter` : Column delimiter. Defaults to `"\\t"`.
+        - `decimals`  : Number of decimal digits. Defaults to `4`.
+
+        ## Returns
+        - `str` : `path`.
+
+        ## Throws
+        - `ValueError` : Thrown when `format` is unknown, or when it is
+                         `"wide"` or `"npz"` and the attributes (or, for
+                         `"npz"`, the resolutions) of the curves differ.
+
+        ## Examples
+        ```python
+        import numpy as np
+        import tdbear.analyzer as ta
+
+        dataset = ta.load_dir("./nanakoberry/**/")
+        dataset.export("./nanakoberry.tsv", meta_keys=["ASSESSOR", "PRODUCT"])
+
+        with np.load(dataset.export("./nanakoberry.npz", "npz")) as npz:
+            data = npz["data"]
+        ```
+        """
+
+        keys: Iterable[str] = (
+            dict.fromkeys(key for c in self for key in c.meta)
+            if meta_keys is None
+            else (key.strip().upper() for key in meta_keys)
+        )
+        table: MetaTable = self.__meta_table()
+
+        return export_curves(
+            self,
+            path,
+            format,
+            {key: table.column(key) for key in keys} if format != "npz" else {},
+            delimiter,
+            decimals,
+        )
+
     def merge(self) -> TDSCurve:
         return TDSCurve.sum(self)
 
@@ -252,11 +790,20 @@ class TDSContainer(list[TDSCurve]):
         scatter_position: float = 1.0,
         vertical: bool = True,
         show: bool = True,
+        *,
+        fig: figure.Figure | None = None,
     ) -> tuple[figure.Figure, plt.Axes]:
+        """# `tdbear.analyzer.TDSContainer.box_plot()`
+
+        Draws the box plot of `map_func` of this container (the distance
+        of each curve from the merged curve by default) on `fig`, or on
+        a new pyplot figure if it is not given.
+        """
 
         data: Sequence[float] = self @ map_func
 
-        fig: figure.Figure = plt.figure()
+        if fig is None:
+            fig = pyplot().figure()
 
         fig.suptitle("Box Plot")
 
@@ -274,6 +821,6 @@ class TDSContainer(list[TDSCurve]):
             ax.scatter(x, y, **scatter_args)
 
         if show:
-            plt.show()
+            pyplot().show()
 
         return (fig, ax)
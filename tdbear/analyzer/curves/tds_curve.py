@@ -1,17 +1,26 @@
 from __future__ import annotations
-from typing import Iterator, Iterable, Self, Any
+from typing import Callable, Iterable, Sequence, Self, TypeAlias, Any, TYPE_CHECKING
 import operator
 import itertools
 import functools
 import warnings
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.figure as figure
+from numpy.typing import DTypeLike
 
-from ..._util import Float64Array
+from ..._util import Float64Array, pyplot
 from ..labels import Labels
-from .curve import Curve
+from .curve import Curve, normalize_columns
+from .run_length import RunLength
+from .dtype_policy import DtypePolicy
+from .relabeling import row_map
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import matplotlib.figure as figure
+
+
+CurveData: TypeAlias = "Float64Array | RunLength"
 
 
 class TDSCurve(Curve):
@@ -21,71 +30,137 @@ class TDSCurve(Curve):
     """
 
     @staticmethod
-    def from_dict(dic: dict, resolution: int = 1000) -> TDSCurve:
+    def from_dict(
+        dic: dict,
+        resolution: int = 1000,
+        lazy: bool = False,
+        compact: bool = False,
+        dtype: DTypeLike | None = None,
+    ) -> TDSCurve:
         timing_data: dict[str, list[float]] = dic["data"]
         duration: float = dic["duration"]
         delay: float = max(itertools.chain.from_iterable(timing_data.values()))
         attr_nums: Labels = Labels.get_instance(sorted(timing_data))
-
-        data: Float64Array = np.zeros((len(attr_nums) + 1, resolution), np.float64)
         meta: dict[str, list[Any]] = dic["meta"]
 
-        r = resolution / duration
-        times: list[tuple[int, int]] = [
-            (attr_nums[attr], round(t * r))
-            for attr in timing_data
-            for t in timing_data[attr]
-        ]
+        data: CurveData | Callable[[], CurveData] = functools.partial(
+            discretize_runs if compact else discretize,
+            timing_data,
+            attr_nums,
+            duration,
+            resolution,
+            DtypePolicy.trial if dtype is None else dtype,
+        )
 
-        times.sort(key=operator.itemgetter(1))
+        if not lazy:
+            data = data()
 
-        times.append((-1, resolution))
+        return TDSCurve(attr_nums, [duration], [delay], data, meta)
 
-        data[-1, : times[0][1]] = 1.0
+    @staticmethod
+    def from_dicts(
+        dics: Iterable[dict],
+        resolution: int = 1000,
+        dtype: DTypeLike | None = None,
+    ) -> list[TDSCurve]:
+        """# `tdbear.analyzer.TDSCurve.from_dicts()`
+
+        Creates `TDSCurve` objects from multiple records at once.
+        Records sharing the same attributes are discretized in one pass
+        into a single `(n_trials, n_attrs + 1, resolution)` array,
+        and the data of each curve is a view into it.
+        The result is the same as that of `TDSCurve.from_dict()`.
+
+        ## Args
+        - `dics`       : Records in the format in which TDSampler outputs.
+        - `resolution` : Number of discretized interval of the entire
+                         duration (start to stop). Defaults to `1000`.
+        - `dtype`      : dtype of the data. Defaults to `DtypePolicy.trial`.
+
+        ## Returns
+        - `list[TDSCurve]` : Curves in the same order as the records.
+        """
+
+        records: list[tuple[dict[str, list[float]], float, float, dict]] = []
+        groups: dict[tuple[str, ...], list[int]] = {}
+
+        for dic in dics:
+            timing_data: dict[str, list[float]] = dic["data"]
+            records.append(
+                (
+                    timing_data,
+                    dic["duration"],
+                    max(itertools.chain.from_iterable(timing_data.values())),
+                    dic["meta"],
+                )
+            )
+            groups.setdefault((*sorted(timing_data),), []).append(len(records) - 1)
+
+        curves: list[TDSCurve] = [None] * len(records)  # type: ignore
+
+        for (keys, indices) in groups.items():
+            attr_nums: Labels = Labels.get_instance(keys)
+            block: Float64Array = discretize_batch(
+                [records[i][0] for i in indices],
+                attr_nums,
+                [records[i][1] for i in indices],
+                resolution,
+                DtypePolicy.trial if dtype is None else dtype,
+            )
 
-        for (a, b) in itertools.pairwise(times):
-            data[a[0], a[1] : b[1]] = 1.0
+            for (i, data) in zip(indices, block):
+                (_, duration, delay, meta) = records[i]
+                curves[i] = TDSCurve(attr_nums, [duration], [delay], data, meta)
 
-        return TDSCurve(attr_nums, [duration], [delay], data, meta)
+        return curves
 
     @classmethod
-    def sum(cls, args: Iterable[Self]) -> Self:
-        it: Iterator[Self] = iter(args)
-        first: Self = next(it)
-        durations: list[float] = [*first.durations]
-        delays: list[float] = [*first.delays]
-        meta: dict[str, list[Any]] = {k: [*v] for (k, v) in first.meta.items()}
-        data: Float64Array = first.data * first.trials_count
-        buff: Float64Array = np.empty(data.shape, float)
+    def sum(cls, args: Iterable[Self], dtype: DTypeLike | None = None) -> Self:
+        """# `tdbear.analyzer.TDSCurve.sum()`
 
-        warn = functools.partial(warn_if_meta_dismatch, {*first.meta})
+        Merges curves, weighting each by its number of trials.
+        Run-length encoded trials are added up at once through their
+        run boundaries, and curves that are views into one array
+        (e.g. those created by `TDSCurve.from_dicts()`) by a single
+        reduction over that array.
 
-        for elem in it:
+        ## Throws
+        - `ValueError` : Thrown when `args` is empty, or the attributes
+                         or the resolutions of the curves differ.
+        """
 
-            check_operable(first, elem)
-            warn(elem)
+        curves: list[TDSCurve] = [*args]
+
+        if not curves:
+            raise ValueError("No curve to merge.")
 
-            for key in {*itertools.chain(first.meta, elem.meta)}:
-                meta[key] += elem.meta[key]
+        first: TDSCurve = curves[0]
+        datas: list[CurveData] = [c.__load() for c in curves]
 
-            durations += elem.durations
-            delays += elem.delays
+        formats: dict[tuple[int, int], TDSCurve] = {
+            (id(c.attr_nums), d.shape[1]): c for (c, d) in zip(curves, datas)
+        }
 
-            np.multiply(elem.data, elem.trials_count, buff)
-            np.add(data, buff, data)
+        for elem in formats.values():
+            check_operable(first, elem)
 
-        np.divide(data, data.sum(0), data)
+        weights: list[int] = [len(c.durations) for c in curves]
+        data: Float64Array = np.zeros(datas[0].shape, DtypePolicy.accumulator)
 
-        name: str
-        if "ASSESSOR" in first.meta:
-            name = (
-                f'{first.meta["ASSESSOR"][0]} and '
-                f"{sum(a.trials_count for a in args) - 1} others"
-            )
-        else:
-            name = f"{sum(a.trials_count for a in args)} trials"
+        add_weighted(datas, weights, data)
+
+        normalize_columns(data, data)
 
-        return TDSCurve(first.attr_nums, durations, delays, data, meta, name).fix()
+        data = data.astype(DtypePolicy.curve if dtype is None else dtype, copy=False)
+
+        return TDSCurve(
+            first.attr_nums,
+            [*itertools.chain.from_iterable(c.durations for c in curves)],
+            [*itertools.chain.from_iterable(c.delays for c in curves)],
+            data,
+            merge_meta([c.meta for c in curves]),
+            merged_name(first, sum(weights)),
+        ).fix()
 
     @property
     def trials_count(self) -> int:
@@ -99,19 +174,69 @@ class TDSCurve(Curve):
     def average_delay(self) -> float:
         return np.mean(self.delays, dtype=float)
 
+    @property
+    def data(self) -> Float64Array:
+        data: CurveData = self.__load()
+
+        if isinstance(data, RunLength):
+            # a temporary dense copy, read-only since writing to it would
+            # not change the curve; the curve itself stays compact
+            data = data.dense()
+            data.flags.writeable = False
+
+        return data
+
+    @data.setter
+    def data(self, data: CurveData) -> None:
+        self.__data = data
+        self.__source = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__data is not None
+
+    @property
+    def is_compact(self) -> bool:
+        return isinstance(self.__data, RunLength)
+
+    @property
+    def delay_proportion(self) -> Float64Array:
+        data: CurveData = self.__load()
+        return data.row(-1) if isinstance(data, RunLength) else data[-1]
+
+    @property
+    def dominance_duration(self) -> Float64Array:
+        data: CurveData = self.__load()
+
+        if isinstance(data, RunLength):
+            return data.row_sums() / self.resolution
+
+        return data.sum(1, DtypePolicy.accumulator) / self.resolution
+
+    @property
+    def resolution(self) -> int:
+        return self.__load().shape[1]
+
     def __init__(
         self,
         attr_nums: Labels,
         durations: list[float],
         delays: list[float],
-        data: Float64Array,
+        data: CurveData | Callable[[], CurveData],
         meta: dict[str, list[Any]],
         name: str | None = None,
     ):
 
+        self.__data: CurveData | None = None
+        self.__source: Callable[[], CurveData] | None = None
+
         self.attr_nums = attr_nums
-        self.data = data
         self.meta = meta
+
+        if callable(data):
+            self.__source = data
+        else:
+            self.data = data
         self.name = name or "No Name"
 
         self.durations: list[float] = durations
@@ -120,6 +245,22 @@ class TDSCurve(Curve):
     def __add__(self, other: Self) -> Self:
         return TDSCurve.sum((self, other))
 
+    def __getitem__(self, i: int | slice, /) -> Float64Array:
+        data: CurveData = self.__load()
+        return data.columns(i) if isinstance(data, RunLength) else data[:, i]
+
+    def __call__(self, *keys: str) -> Float64Array:
+        data: CurveData = self.__load()
+
+        if not isinstance(data, RunLength) or not keys:
+            return super().__call__(*keys)
+
+        elif len(keys) == 1:
+            return data.row(self.attr_nums[str(keys[0])])
+
+        else:
+            return np.array([data.row(self.attr_nums[str(key)]) for key in keys])
+
     def __radd__(self, other: Self) -> Self:
         return other + self
 
@@ -132,9 +273,103 @@ class TDSCurve(Curve):
             f'trial{"" if self.trials_count <= 1 else "s"}]'
         )
 
+    def fix(self) -> Self:
+        if isinstance(self.__load(), RunLength):
+            return self
+
+        return super().fix()
+
+    def relabel(self, attr_nums: Labels, *, fold_into_delay: bool = False) -> Self:
+        data: CurveData = self.__load()
+
+        if isinstance(data, RunLength) and attr_nums != self.attr_nums:
+            runs: RunLength | None = data.relabel(
+                row_map(self.attr_nums, attr_nums, fold_into_delay),
+                len(attr_nums) + 1,
+            )
+
+            if runs is not None:
+                self.__data = runs
+                self.attr_nums = attr_nums
+
+                return self
+
+        return super().relabel(attr_nums, fold_into_delay=fold_into_delay)
+
+    def compact(self) -> Self:
+        """# `tdbear.analyzer.TDSCurve.compact()`
+
+        Stores the data in the run-length encoded form if every column
+        of it is one-hot (i.e. the curve is a single trial). `data` of
+        a compact curve is a read-only dense copy made on each access,
+        so operations that need the whole array (e.g. `distance`) leave
+        the curve compact. Operations that replace the data in place,
+        such as `Curve.smooth()`, store it densely.
+        """
+
+        runs: RunLength | None = self.run_length()
+
+        if runs is not None:
+            self.__data = runs
+
+        return self
+
+    def run_length(self) -> RunLength | None:
+        """# `tdbear.analyzer.TDSCurve.run_length()`
+
+        Returns the data in the run-length encoded form,
+        or `None` if the data is not one-hot in every column.
+        """
+
+        data: CurveData = self.__load()
+        return data if isinstance(data, RunLength) else RunLength.from_dense(data)
+
+    def add_to(
+        self, out: Float64Array, weight: float = 1.0, buff: Float64Array | None = None
+    ) -> Float64Array:
+        """# `tdbear.analyzer.TDSCurve.add_to()`
+
+        Adds the data multiplied by `weight` to `out` in place.
+        """
+
+        data: CurveData = self.__load()
+
+        if isinstance(data, RunLength):
+            return data.add_to(out, weight)
+
+        if buff is None:
+            buff = np.empty(out.shape, out.dtype)
+
+        np.multiply(data, weight, buff)
+
+        return np.add(out, buff, out)
+
+    def release(self) -> Self:
+        """# `tdbear.analyzer.TDSCurve.release()`
+
+        Drops the data of a lazily loaded curve. The data will be
+        discretized again on the next access, so any in-place
+        modification of it is lost. Curves whose data was given directly
+        are not affected.
+        """
+
+        if self.__source is not None:
+            self.__data = None
+
+        return self
+
+    def __load(self) -> CurveData:
+        if self.__data is None:
+            self.__data = self.__source()
+
+        return self.__data
+
     def distance(self, other: Self) -> float:
         check_operable(self, other)
-        return np.mean((((self.data - other.data) ** 2).sum(0) / 2) ** 0.5, dtype=float)
+        diff: Float64Array = np.subtract(
+            self.data, other.data, dtype=DtypePolicy.accumulator
+        )
+        return np.mean(((diff**2).sum(0) / 2) ** 0.5, dtype=float)
 
     def draw(
         self,
@@ -155,14 +390,24 @@ class TDSCurve(Curve):
         delay_args: dict[str, Any] = {},
         average_delay_args: dict[str, Any] = {},
         legend_args: dict[str, Any] = {},
+        *,
+        fig: figure.Figure | None = None,
     ) -> tuple[figure.Figure, list[list[plt.Axes]]]:
+        """# `tdbear.analyzer.TDSCurve.draw()`
+
+        Draws the curves of the attributes in `layout`, a grid of subplots
+        each listing the attributes drawn on it. The subplots are added to
+        `fig` if it is given (e.g. a `matplotlib.figure.Figure` created
+        without pyplot, see `render_figures()`), or to a new pyplot figure
+        otherwise.
+        """
 
         if layout is None:
             layout = [[[*self.attr_nums]]]
 
         rows: int = len(layout)
         columns: int = max(map(len, layout))
-        axes: list[list[plt.Axes]] = [[]] * rows
+        axes: list[list[plt.Axes]] = [[] for _ in range(rows)]
         ax_number: int = 1
         time_ax: Float64Array = np.concatenate(
             [
@@ -171,7 +416,9 @@ class TDSCurve(Curve):
             ]
         )
 
-        fig: figure.Figure = plt.figure()
+        if fig is None:
+            fig = pyplot().figure()
+
         fig.suptitle(self.name)
 
         for (i, row) in enumerate(layout):
@@ -296,15 +543,352 @@ class TDSCurve(Curve):
 
         # show graph or not
         if show:
-            plt.show()
+            pyplot().show()
 
         return (fig, axes)
 
 
+class TDSAccumulator:
+    """# `tdbear.analyzer.TDSAccumulator`
+
+    Running sum of `TDSCurve` objects. Adding curves one by one and
+    calling `result()` gives the same curve as `TDSCurve.sum()`, while
+    only one `(n_attrs + 1, resolution)` array is kept in memory.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    accumulator = ta.TDSAccumulator()
+
+    for curve in ta.iter_dir("./nanakoberry/**/"):
+        accumulator.add(curve)
+
+    merged = accumulator.result()
+    ```
+    """
+
+    def __init__(self):
+        self.first: TDSCurve | None = None
+        self.trials_count: int = 0
+        self.durations: list[float] = []
+        self.delays: list[float] = []
+        self.meta: dict[str, list[Any]] = {}
+
+        self.__data: Float64Array | None = None
+        self.__buff: Float64Array | None = None
+        self.__warn: Callable[[TDSCurve], None] | None = None
+
+    def add(self, curve: TDSCurve) -> Self:
+        """# `tdbear.analyzer.TDSAccumulator.add()`
+
+        ## Throws
+        - `ValueError` : Thrown when the attributes or the resolution
+                         differ from those of the first curve.
+        """
+
+        if self.first is None:
+            self.first = curve
+            self.meta = {k: [*v] for (k, v) in curve.meta.items()}
+            self.__data = np.zeros(
+                (len(curve.attr_nums) + 1, curve.resolution), DtypePolicy.accumulator
+            )
+            self.__buff = np.empty(self.__data.shape, self.__data.dtype)
+            self.__warn = functools.partial(warn_if_meta_dismatch, {*curve.meta})
+
+        else:
+            check_operable(self.first, curve)
+            self.__warn(curve)
+
+            for key in {*itertools.chain(self.first.meta, curve.meta)}:
+                self.meta[key] += curve.meta[key]
+
+        self.durations += curve.durations
+        self.delays += curve.delays
+
+        curve.add_to(self.__data, curve.trials_count, self.__buff)
+        self.trials_count += curve.trials_count
+
+        return self
+
+    def result(self, dtype: DTypeLike | None = None) -> TDSCurve:
+        """# `tdbear.analyzer.TDSAccumulator.result()`
+
+        Returns the merged curve of the curves added so far.
+        More curves can still be added afterwards.
+
+        ## Throws
+        - `ValueError` : Thrown when no curve has been added.
+        """
+
+        if self.first is None or self.__data is None:
+            raise ValueError("No curve has been added.")
+
+        data: Float64Array = normalize_columns(self.__data)
+
+        data = data.astype(DtypePolicy.curve if dtype is None else dtype, copy=False)
+
+        return TDSCurve(
+            self.first.attr_nums,
+            [*self.durations],
+            [*self.delays],
+            data,
+            {k: [*v] for (k, v) in self.meta.items()},
+            merged_name(self.first, self.trials_count),
+        ).fix()
+
+
+def add_weighted(
+    datas: Sequence[CurveData], weights: Sequence[float], out: Float64Array
+) -> Float64Array:
+    """Adds `datas` multiplied by `weights` to `out` in place."""
+
+    (height, width) = out.shape
+    runs: list[tuple[RunLength, float]] = []
+    blocks: dict[int, tuple[np.ndarray, list[int], list[float]]] = {}
+    buff: Float64Array | None = None
+
+    for (data, weight) in zip(datas, weights):
+        if isinstance(data, RunLength):
+            runs.append((data, weight))
+            continue
+
+        base: Any = data.base
+
+        if (
+            isinstance(base, np.ndarray)
+            and base.ndim == 3
+            and base.shape[1:] == out.shape
+            and base.dtype == data.dtype
+            and base.flags.c_contiguous
+            and data.flags.c_contiguous
+            and (data.ctypes.data - base.ctypes.data) % base.strides[0] == 0
+        ):
+            (_, rows, row_weights) = blocks.setdefault(id(base), (base, [], []))
+            rows.append((data.ctypes.data - base.ctypes.data) // base.strides[0])
+            row_weights.append(weight)
+
+        elif weight == 1:
+            np.add(out, data, out)
+
+        else:
+            if buff is None:
+                buff = np.empty(out.shape, out.dtype)
+
+            np.multiply(data, weight, buff)
+            np.add(out, buff, out)
+
+    if runs:
+        # a run adds its weight from its start to its end, so adding the
+        # weight at the start and subtracting it at the end of each run
+        # and taking the cumulative sum gives the sum of all trials
+        counts: list[int] = [len(r.starts) for (r, _) in runs]
+        starts: np.ndarray = np.concatenate([r.starts for (r, _) in runs])
+        rows: np.ndarray = np.concatenate([r.rows for (r, _) in runs])
+        ends: np.ndarray = np.empty_like(starts)
+        ends[:-1] = starts[1:]
+        ends[np.cumsum(counts) - 1] = width
+
+        rows = rows.astype(np.intp) * (width + 1)
+        run_weights: Float64Array = np.repeat(
+            np.array([w for (_, w) in runs], np.float64), counts
+        )
+        diff: Float64Array = np.bincount(
+            rows + starts, run_weights, height * (width + 1)
+        ) - np.bincount(rows + ends, run_weights, height * (width + 1))
+
+        out += np.cumsum(diff.reshape(height, width + 1), 1)[:, :width]
+
+    for (base, rows, row_weights) in blocks.values():
+        index: np.ndarray = np.array(rows, np.intp)
+        block_weights: Float64Array = np.bincount(index, row_weights, len(base))
+
+        if len(index) * 2 < len(base):
+            index = np.unique(index)
+            out += np.tensordot(block_weights[index], base[index], 1)
+        else:
+            out += np.tensordot(block_weights, base, 1)
+
+    return out
+
+
+def merge_meta(metas: Sequence[dict[str, list[Any]]]) -> dict[str, list[Any]]:
+    """Concatenates the values of each key of `metas`, key by key."""
+
+    keys: set[str] = {*metas[0]}
+
+    for meta in metas:
+        if meta.keys() != keys:
+            warnings.warn(
+                "Metadata of different types are mixed. " 'Please review "meta" field.',
+                Warning,
+            )
+            raise KeyError(next(iter(keys ^ meta.keys())))
+
+    return {
+        key: [*itertools.chain.from_iterable(map(operator.itemgetter(key), metas))]
+        for key in metas[0]
+    }
+
+
+def merged_name(first: TDSCurve, trials_count: int) -> str:
+    if "ASSESSOR" in first.meta:
+        return f'{first.meta["ASSESSOR"][0]} and {trials_count - 1} others'
+    else:
+        return f"{trials_count} trials"
+
+
+# trials with more responses than this are discretized as arrays
+_FEW_RESPONSES: int = 32
+
+
+def discretize(
+    timing_data: dict[str, list[float]],
+    attr_nums: Labels,
+    duration: float,
+    resolution: int,
+    dtype: DTypeLike = np.float64,
+) -> Float64Array:
+    if sum(map(len, timing_data.values())) > _FEW_RESPONSES:
+        return discretize_runs(
+            timing_data, attr_nums, duration, resolution, dtype
+        ).dense()
+
+    # a few responses: sorting a list and writing one slice per response
+    # costs less than building the arrays of `discretize_runs()`
+    data: Float64Array = np.zeros((len(attr_nums) + 1, resolution), dtype)
+
+    r = resolution / duration
+    times: list[tuple[int, int]] = [
+        (attr_nums[attr], min(max(round(t * r), 0), resolution))
+        for attr in timing_data
+        for t in timing_data[attr]
+    ]
+
+    times.sort(key=operator.itemgetter(1))
+
+    times.append((-1, resolution))
+
+    data[-1, : times[0][1]] = 1
+
+    for (a, b) in itertools.pairwise(times):
+        data[a[0], a[1] : b[1]] = 1
+
+    return data
+
+
+def discretize_runs(
+    timing_data: dict[str, list[float]],
+    attr_nums: Labels,
+    duration: float,
+    resolution: int,
+    dtype: DTypeLike = np.float64,
+) -> RunLength:
+    counts: list[int] = [*map(len, timing_data.values())]
+    count: int = sum(counts) + 1
+
+    # the delay row is selected from time 0 until the first response
+    times: Float64Array = np.fromiter(
+        itertools.chain((0.0,), *timing_data.values()), np.float64, count
+    )
+    attrs: np.ndarray = np.fromiter(
+        itertools.chain(
+            (len(attr_nums),),
+            *map(itertools.repeat, map(attr_nums.__getitem__, timing_data), counts),
+        ),
+        np.int32,
+        count,
+    )
+
+    # `np.rint` rounds half to even just as `round` does
+    index: np.ndarray = np.rint(times * (resolution / duration)).astype(np.int32)
+    np.clip(index, 0, resolution, index)
+    order: np.ndarray = index.argsort(kind="stable")
+
+    return RunLength(
+        (len(attr_nums) + 1, resolution), index[order], attrs[order], dtype
+    )
+
+
+def discretize_batch(
+    timing_data: Sequence[dict[str, list[float]]],
+    attr_nums: Labels,
+    durations: Sequence[float],
+    resolution: int,
+    dtype: DTypeLike = np.float64,
+) -> Float64Array:
+    height: int = len(attr_nums) + 1
+    counts: list[int] = [sum(map(len, d.values())) + 1 for d in timing_data]
+    count: int = sum(counts)
+
+    # each trial starts with the delay row at time 0
+    times: Float64Array = np.fromiter(
+        itertools.chain.from_iterable(
+            itertools.chain((0.0,), *d.values()) for d in timing_data
+        ),
+        np.float64,
+        count,
+    )
+    attrs: np.ndarray = np.fromiter(
+        itertools.chain.from_iterable(
+            itertools.chain(
+                (height - 1,),
+                *(itertools.repeat(attr_nums[k], len(v)) for (k, v) in d.items()),
+            )
+            for d in timing_data
+        ),
+        np.intp,
+        count,
+    )
+    trials: np.ndarray = np.repeat(np.arange(len(timing_data)), counts)
+    scales: Float64Array = resolution / np.asarray(durations, np.float64)
+
+    index: np.ndarray = np.rint(times * scales[trials]).astype(np.intp)
+    np.clip(index, 0, resolution, index)
+    order: np.ndarray = (trials * (resolution + 1) + index).argsort(kind="stable")
+
+    starts: np.ndarray = index[order]
+    bounds: np.ndarray = np.cumsum([0, *counts])
+    ends: np.ndarray = np.empty_like(starts)
+    ends[:-1] = starts[1:]
+    ends[bounds[1:] - 1] = resolution
+    lengths: np.ndarray = ends - starts
+
+    data: Float64Array = np.zeros((len(timing_data), height, resolution), dtype)
+
+    if count * 32 <= data.size // height:
+        # few long runs: filling slices writes nothing but the ones
+        rows: list[int] = attrs[order].tolist()
+
+        for (t, i, s, e) in zip(trials.tolist(), rows, starts.tolist(), ends.tolist()):
+            data[t, i, s:e] = 1
+
+        return data
+
+    # offset of each run in the flattened array, less the column offset
+    # of its trial so that adding the running column index lands on it
+    offsets: np.ndarray = ((height - 1) * trials + attrs[order]) * resolution
+    flat: Float64Array = data.reshape(-1)
+
+    # scatter a bounded number of columns at a time
+    step: int = max(1, 2**20 // max(resolution, 1))
+
+    for t in range(0, len(timing_data), step):
+        u: int = min(t + step, len(timing_data))
+        flat[
+            np.repeat(offsets[bounds[t] : bounds[u]], lengths[bounds[t] : bounds[u]])
+            + np.arange(t * resolution, u * resolution)
+        ] = 1
+
+    return data
+
+
 def check_operable(left: TDSCurve, right: TDSCurve) -> None:
     if left.attr_nums != right.attr_nums:
         raise ValueError(
-            "Different formats are mixed. " "Please review attribute words."
+            "Different formats are mixed. "
+            "Please review attribute words, or unify them "
+            "with TDSContainer.harmonize()."
         )
 
     elif left.resolution != right.resolution:
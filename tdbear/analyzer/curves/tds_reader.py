@@ -0,0 +1,221 @@
+from __future__ import annotations
+from io import TextIOWrapper
+from typing import Iterator, Any
+import re
+
+import yaml
+
+
+# libyaml is used for documents the line parser does not understand
+_Loader: type = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_FLOAT = r"[-+]?[0-9]+\.[0-9]*(?:[eE][-+][0-9]+)?"
+_FLOAT_LIST = re.compile(rf" *(?:{_FLOAT} *, *)*{_FLOAT} *")
+_INT = re.compile(r"[-+]?(?:0|[1-9][0-9]*)")
+_FLOAT_ONLY = re.compile(_FLOAT)
+_WORD = re.compile(r"[^\W\d](?:[\w\-./ ]*[\w\-./])?")
+_SINGLE_QUOTED = re.compile(r"'((?:[^']|'')*)'")
+_DOUBLE_QUOTED = re.compile(r'"([^"\\]*)"')
+_KEY_VALUE = re.compile(r"( *)([^\s:#][^:#]*?):(?: +(.*))?")
+_LIST_ITEM = re.compile(r"( *)- +(.*)")
+
+# plain scalars that YAML 1.1 resolves to booleans or null
+_RESERVED: frozenset[str] = frozenset(
+    "yes Yes YES no No NO true True TRUE false False FALSE "
+    "on On ON off Off OFF null Null NULL".split()
+)
+
+_SECTIONS: frozenset[str] = frozenset(("meta", "data"))
+
+
+class _Unusual(Exception):
+    pass
+
+
+def read_records(yml: str | TextIOWrapper) -> Iterator[dict[str, Any]]:
+    """# `tdbear.analyzer.curves.tds_reader.read_records()`
+
+    Parses records in the format in which TDSampler outputs.
+    Documents are read by a line parser specialized for the TDSampler
+    schema (`meta`, `duration` and `data`). Documents that use any other
+    YAML feature are handed to the libyaml loader (or the pure-Python
+    loader when libyaml is not available), so the result is always
+    the same as that of `yaml.safe_load_all()`.
+
+    ## Args
+    - `yml` : YAML string or text stream.
+
+    ## Returns
+    - `Iterator[dict[str, Any]]` : Parsed records.
+
+    ## Throws
+    - `yaml.YAMLError` : Thrown when the input is not valid YAML.
+    """
+
+    text: str = yml if isinstance(yml, str) else yml.read()
+    lines: list[str] = text.splitlines()
+
+    if any(line.startswith(("%", "...")) for line in lines):
+        yield from yaml.load_all(text, _Loader)
+        return
+
+    start: int = 0
+
+    for (i, line) in enumerate([*lines, "---"]):
+        if line.startswith("---") and (len(line) == 3 or line[3] in " \t"):
+            if i > start or start:
+                yield from _parse_document(lines[start:i])
+
+            start = i
+
+
+def _parse_document(lines: list[str]) -> Iterator[Any]:
+    body: list[str] = [
+        line for line in lines if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+    if body and body[0].startswith("---"):
+        if body[0].rstrip() != "---":
+            yield from yaml.load_all("\n".join(lines), _Loader)
+            return
+
+        body = body[1:]
+
+    if not body:
+        yield from yaml.load_all("\n".join(lines), _Loader)
+        return
+
+    try:
+        yield _parse_record(body)
+
+    except _Unusual:
+        yield from yaml.load_all("\n".join(lines), _Loader)
+
+
+def _parse_record(lines: list[str]) -> dict[str, Any]:
+    record: dict[str, Any] = {}
+    section: dict[str, Any] | None = None
+    items: list[Any] | None = None
+    indent: int = -1
+    # indentation of the items of `items`, which must all be the same
+    item_indent: int = -1
+
+    for line in lines:
+        if "\t" in line:
+            raise _Unusual()
+
+        item = _LIST_ITEM.fullmatch(line.rstrip())
+
+        if item is not None:
+            if items is None or len(item[1]) < indent:
+                raise _Unusual()
+
+            if not items:
+                item_indent = len(item[1])
+            elif len(item[1]) != item_indent:
+                raise _Unusual()
+
+            items.append(_parse_scalar(item[2]))
+            continue
+
+        kv = _KEY_VALUE.fullmatch(line.rstrip())
+
+        if kv is None:
+            raise _Unusual()
+
+        (spaces, key, value) = (len(kv[1]), kv[2], kv[3])
+
+        _check_closed(section if spaces == 0 else None, items)
+
+        if spaces == 0:
+            items = None
+
+            if key in _SECTIONS and value is None:
+                section = record[key] = {}
+                indent = -1
+
+            elif key in _SECTIONS and value == "{}":
+                section = None
+                record[key] = {}
+
+            elif key == "duration" and value is not None:
+                section = None
+                record[key] = _parse_scalar(value)
+
+            else:
+                raise _Unusual()
+
+        elif section is not None and indent in (-1, spaces):
+            indent = spaces
+            name = _parse_scalar(key)
+
+            if not isinstance(name, str):
+                raise _Unusual()
+
+            if value is None:
+                items = section[name] = []
+
+            else:
+                items = None
+                section[name] = _parse_value(value)
+
+        else:
+            raise _Unusual()
+
+    _check_closed(section, items)
+
+    return record
+
+
+def _check_closed(section: dict[str, Any] | None, items: list[Any] | None) -> None:
+    # a key without a value nor nested lines is null in YAML,
+    # which the records of TDSampler never contain
+    if items is not None and not items:
+        raise _Unusual()
+
+    if section is not None and not section:
+        raise _Unusual()
+
+
+def _parse_value(value: str) -> Any:
+    if not value.startswith("["):
+        return _parse_scalar(value)
+
+    if not value.endswith("]"):
+        raise _Unusual()
+
+    inner: str = value[1:-1]
+
+    if not inner.strip():
+        return []
+
+    if _FLOAT_LIST.fullmatch(inner):
+        return [*map(float, inner.split(","))]
+
+    if any(c in inner for c in "[]{}'\""):
+        raise _Unusual()
+
+    return [*map(_parse_scalar, map(str.strip, inner.split(",")))]
+
+
+def _parse_scalar(value: str) -> Any:
+    if _FLOAT_ONLY.fullmatch(value):
+        return float(value)
+
+    if _INT.fullmatch(value):
+        return int(value)
+
+    if _WORD.fullmatch(value) and value not in _RESERVED:
+        return value
+
+    quoted = _SINGLE_QUOTED.fullmatch(value)
+
+    if quoted is not None:
+        return quoted[1].replace("''", "'")
+
+    quoted = _DOUBLE_QUOTED.fullmatch(value)
+
+    if quoted is not None:
+        return quoted[1]
+
+    raise _Unusual()
@@ -0,0 +1,426 @@
+from __future__ import annotations
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    SupportsIndex,
+    Sequence,
+    Self,
+    Any,
+    overload,
+    TYPE_CHECKING,
+)
+import random
+import functools
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from ..._util import Float64Array
+from ..labels import Labels
+from .tds_curve import TDSCurve, check_operable, merge_meta, merged_name
+from .tds_container import TDSContainer
+from .curve import normalize_columns
+from .dtype_policy import DtypePolicy
+from .smoothing import smooth_data
+from .resampling import resample_data
+from .time_query import time_columns, values_at
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import matplotlib.figure as figure
+
+
+# number of elements processed at a time by chunked operations
+_CHUNK: int = 2**16
+
+
+class TDSTensor:
+    """# `tdbear.analyzer.TDSTensor`
+
+    A container of single TDS trials backed by one contiguous
+    `(n_trials, n_attrs + 1, resolution)` array, with the durations and
+    the delays of the trials as vectors. Indexing with a slice, an index
+    array or a boolean mask, `filter()` and `bootstrap()` return views that
+    share the array, and `merge()`, `distance()`, `smooth()` and `fix()`
+    run as NumPy operations over the whole array.
+
+    Iterating it yields `TDSCurve` objects whose data are views into
+    the array, so functions written for `TDSContainer` keep working.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    tensor = ta.load_dir("./nanakoberry/**/").to_tensor()
+    merged = tensor.filter(lambda x: x.get_meta("ASSESSOR") == "PA").merge()
+    ```
+    """
+
+    def __init__(self, curves: Iterable[TDSCurve], /):
+        """# `tdbear.analyzer.TDSTensor()`
+
+        Stacks the data of single trials into one array.
+        Curves whose data are already consecutive views into one array
+        (e.g. those created by `TDSCurve.from_dicts()`) share it
+        without copying.
+
+        ## Args
+        - `curves` : Single trials with the same attributes and resolution.
+
+        ## Throws
+        - `ValueError` : Thrown when `curves` is empty, contains a curve
+                         of multiple trials, or mixes different attributes
+                         or resolutions.
+        """
+
+        curves = [*curves]
+
+        if not curves:
+            raise ValueError("Cannot create a TDSTensor of no curves.")
+
+        for curve in curves:
+            if curve.trials_count != 1:
+                raise ValueError("Only single trials can be stacked.")
+
+            check_operable(curves[0], curve)
+
+        datas: list[Float64Array] = [curve.data for curve in curves]
+        block: Float64Array | None = _shared_block(datas)
+
+        self.__init(
+            curves[0].attr_nums,
+            np.stack(datas) if block is None else block,
+            curves,
+        )
+
+    def __init(
+        self,
+        attr_nums: Labels,
+        block: Float64Array,
+        curves: Sequence[TDSCurve],
+    ) -> None:
+        self.attr_nums: Labels = attr_nums
+        self.block: Float64Array = block
+        self.durations_all: Float64Array = np.array(
+            [c.durations[0] for c in curves], np.float64
+        )
+        self.delays_all: Float64Array = np.array(
+            [c.delays[0] for c in curves], np.float64
+        )
+        self.curves: list[TDSCurve] = [
+            TDSCurve(attr_nums, [*c.durations], [*c.delays], data, c.meta, c.name)
+            for (c, data) in zip(curves, block)
+        ]
+        self.index: np.ndarray = np.arange(len(block))
+
+    def __view(self, index: np.ndarray) -> Self:
+        obj: TDSTensor = object.__new__(TDSTensor)
+        obj.attr_nums = self.attr_nums
+        obj.block = self.block
+        obj.durations_all = self.durations_all
+        obj.delays_all = self.delays_all
+        obj.curves = self.curves
+        obj.index = index
+
+        return obj
+
+    def __derive(self, block: Float64Array) -> Self:
+        obj: TDSTensor = object.__new__(TDSTensor)
+        obj.__init(self.attr_nums, block, [*self])
+
+        return obj
+
+    @property
+    def data(self) -> Float64Array:
+        """# `tdbear.analyzer.TDSTensor.data`
+
+        `(n_trials, n_attrs + 1, resolution)` array of the trials.
+        This is a view when the trials are a contiguous range of the
+        underlying array, and a copy otherwise.
+        """
+
+        index: np.ndarray = self.index
+
+        if len(index) and index[-1] - index[0] + 1 == len(index):
+            if (np.diff(index) == 1).all():
+                return self.block[index[0] : index[-1] + 1]
+
+        return self.block[index]
+
+    @property
+    def durations(self) -> Float64Array:
+        return self.durations_all[self.index]
+
+    @property
+    def delays(self) -> Float64Array:
+        return self.delays_all[self.index]
+
+    @property
+    def resolution(self) -> int:
+        return self.block.shape[2]
+
+    def __len__(self, /) -> int:
+        return len(self.index)
+
+    def __abs__(self, /) -> int:
+        return len(self.index)
+
+    def __iter__(self, /) -> Iterator[TDSCurve]:
+        return map(self.curves.__getitem__, self.index.tolist())
+
+    @overload
+    def __getitem__(self, index: SupportsIndex, /) -> TDSCurve:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice | Sequence[int] | np.ndarray, /) -> Self:
+        ...
+
+    def __getitem__(self, index, /):
+        if isinstance(index, SupportsIndex) and not isinstance(index, np.ndarray):
+            return self.curves[self.index[index]]
+
+        return self.__view(self.index[index])
+
+    def __matmul__(self, func: Callable[[Self], Any], /) -> Any:
+        return func(self)
+
+    def __rshift__(self, func: Callable[[TDSCurve], Any], /) -> list[Any]:
+        return [*map(func, self)]
+
+    def __repr__(self, /) -> str:
+        n: int = len(self)
+        return (
+            f"[TDSTensor of {n} trial{'' if n <= 1 else 's'}, "
+            f"shape {(n, *self.block.shape[1:])}]"
+        )
+
+    def to_container(self) -> TDSContainer:
+        """# `tdbear.analyzer.TDSTensor.to_container()`
+
+        Returns a `TDSContainer` of the trials. Their data are still
+        views into the array of this object.
+        """
+
+        return TDSContainer(self)
+
+    def map(self, func: Callable[[TDSCurve], TDSCurve]) -> TDSContainer:
+        return TDSContainer(map(func, self))
+
+    def filter(self, func: Callable[[TDSCurve], bool]) -> Self:
+        return self.__view(self.index[[bool(func(curve)) for curve in self]])
+
+    def group_by(
+        self, func: str | Callable[[TDSCurve], Hashable]
+    ) -> dict[Hashable, Self]:
+
+        group_func: Callable[[TDSCurve], Hashable] = (
+            functools.partial(TDSCurve.get_meta, key=func)
+            if isinstance(func, str)
+            else func
+        )
+        groups: dict[Hashable, list[int]] = {}
+
+        for (i, curve) in zip(self.index.tolist(), self):
+            groups.setdefault(curve @ group_func, []).append(i)
+
+        return {k: self.__view(np.array(v)) for (k, v) in groups.items()}
+
+    def get_meta(self, key: str) -> list[Any]:
+        return self >> (lambda e: TDSCurve.get_meta(e, key))
+
+    def get_meta_all(self, key: str) -> list[list[Any]]:
+        return self >> (lambda e: TDSCurve.get_meta_all(e, key))
+
+    def bootstrap(self, size: int | None = None) -> Self:
+        k: int = len(self) if size is None else size
+
+        return self.__view(np.array(random.choices(self.index, k=k), np.intp))
+
+    def merge(self, dtype: DTypeLike | None = None) -> TDSCurve:
+        """# `tdbear.analyzer.TDSTensor.merge()`
+
+        Merges the trials like `TDSCurve.sum()`, adding up the data
+        with a single reduction over the array. A trial that appears
+        several times (e.g. after `bootstrap()`) is counted each time.
+        """
+
+        (unique, counts) = np.unique(self.index, return_counts=True)
+        block: Float64Array = (
+            self.block if len(unique) == len(self.block) else self.block[unique]
+        )
+        data: Float64Array = np.tensordot(
+            counts.astype(DtypePolicy.accumulator), block, 1
+        )
+
+        normalize_columns(data, data)
+
+        curves: list[TDSCurve] = [*self]
+
+        return TDSCurve(
+            self.attr_nums,
+            self.durations.tolist(),
+            self.delays.tolist(),
+            data.astype(DtypePolicy.curve if dtype is None else dtype, copy=False),
+            merge_meta([c.meta for c in curves]),
+            merged_name(curves[0], len(curves)),
+        ).fix()
+
+    def merge_as(self, name: str) -> TDSCurve:
+        return self.merge().set_name(name)
+
+    def distance(
+        self, distance_func: Callable[[TDSCurve, TDSCurve], float] | None = None
+    ) -> list[float]:
+        """# `tdbear.analyzer.TDSTensor.distance()`
+
+        Distances between each trial and the merged curve.
+        `TDSCurve.distance` is computed over the array in chunks unless
+        another `distance_func` is given.
+        """
+
+        merged: TDSCurve = self.merge()
+
+        if distance_func is not None:
+            return self >> (lambda x: distance_func(x, merged))
+
+        result: Float64Array = np.empty(len(self), np.float64)
+        step: int = max(1, _CHUNK // merged.data.size)
+        diff: Float64Array = np.empty(
+            (step, *merged.data.shape), DtypePolicy.accumulator
+        )
+
+        for i in range(0, len(self), step):
+            index: np.ndarray = self.index[i : i + step]
+            buff: Float64Array = diff[: len(index)]
+
+            np.subtract(self.block[index], merged.data, buff)
+            np.square(buff, buff)
+            result[i : i + step] = ((buff.sum(1) / 2) ** 0.5).mean(1)
+
+        return result.tolist()
+
+    def smooth(
+        self,
+        level: float = 0.01,
+        dtype: DTypeLike | None = None,
+        *,
+        kernel: str = "moving",
+    ) -> Self:
+        """# `tdbear.analyzer.TDSTensor.smooth()`
+
+        Applies `Curve.smooth()` to all trials at once along the time
+        axis. Returns a new `TDSTensor`; this object and the curves
+        it contains are not modified.
+        """
+
+        return self.__derive(
+            smooth_data(self.data, int(level * self.resolution), kernel, dtype)
+        )
+
+    def resample(
+        self,
+        resolution: int,
+        phase: float = 1.0,
+        *,
+        method: str = "stride",
+        dtype: DTypeLike | None = None,
+    ) -> Self:
+        """# `tdbear.analyzer.TDSTensor.resample()`
+
+        Resamples all trials at once along the time axis, like
+        `TDSContainer.resample()`. `method` defaults to `"stride"`, as in
+        `Curve.resample()`. Returns a new `TDSTensor`.
+        """
+
+        return self.__derive(
+            np.ascontiguousarray(
+                resample_data(self.data, resolution, method, phase, dtype)
+            )
+        )
+
+    def at_times(
+        self, normalized_times: float | Iterable[float], include_delay: bool = False
+    ) -> tuple[Float64Array, Labels]:
+        """# `tdbear.analyzer.TDSTensor.at_times()`
+
+        Same as `TDSContainer.at_times()`, taking the columns
+        of all trials from the array at once.
+        """
+
+        (columns, before) = time_columns(normalized_times, self.resolution)
+        # only the columns of the trials of this view are gathered
+        selected: np.ndarray = self.block[
+            np.ix_(self.index, np.arange(self.block.shape[1]), columns)
+        ]
+
+        return (
+            values_at(selected, before, include_delay),
+            self.attr_nums,
+        )
+
+    def fix(self) -> Self:
+        """# `tdbear.analyzer.TDSTensor.fix()`
+
+        Normalizes every column of all trials to sum to 1.
+        Returns a new `TDSTensor`.
+        """
+
+        data: Float64Array = self.data
+
+        return self.__derive(
+            normalize_columns(data, axis=1).astype(
+                data.dtype
+                if np.issubdtype(data.dtype, np.inexact)
+                else DtypePolicy.curve,
+                copy=False,
+            )
+        )
+
+    def box_plot(
+        self,
+        map_func: Callable[[Self], Sequence[float]] | None = None,
+        boxplot_args: dict[str, Any] = {},
+        scatter_args: dict[str, Any] = {},
+        show_scattter: bool = True,
+        scatter_position: float = 1.0,
+        vertical: bool = True,
+        show: bool = True,
+        *,
+        fig: figure.Figure | None = None,
+    ) -> tuple[figure.Figure, plt.Axes]:
+
+        return TDSContainer.box_plot(
+            self,  # type: ignore
+            TDSTensor.distance if map_func is None else map_func,
+            boxplot_args,
+            scatter_args,
+            show_scattter,
+            scatter_position,
+            vertical,
+            show,
+            fig=fig,
+        )
+
+
+def _shared_block(datas: list[Float64Array]) -> Float64Array | None:
+    base: np.ndarray | None = datas[0].base
+
+    if (
+        not isinstance(base, np.ndarray)
+        or base.ndim != 3
+        or len(base) != len(datas)
+        or not base.flags.c_contiguous
+    ):
+        return None
+
+    address: int = base.ctypes.data
+    step: int = base.strides[0]
+
+    for (i, data) in enumerate(datas):
+        if data.base is not base or data.ctypes.data != address + i * step:
+            return None
+
+    return base
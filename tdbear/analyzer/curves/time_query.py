@@ -0,0 +1,58 @@
+from __future__ import annotations
+from typing import Iterable
+
+import numpy as np
+
+from ..._util import Float64Array
+
+
+def time_columns(
+    normalized_times: float | Iterable[float], resolution: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """# `tdbear.analyzer.curves.time_columns()`
+
+    Column of the data at each normalized time, and whether each time
+    is the start of the trial, before the first column (whose column
+    is then `0`).
+
+    ## Throws
+    - `ValueError` : Thrown when a time is not in range `[0.0, 1.0]`.
+    """
+
+    times: Float64Array = np.asarray(
+        normalized_times if np.ndim(normalized_times) else [normalized_times],
+        np.float64,
+    ).reshape(-1)
+
+    if not ((0.0 <= times) & (times <= 1.0)).all():
+        raise ValueError("Normalized time must be " "in range [0.0, 1.0].")
+
+    columns: np.ndarray = np.rint(times * resolution).astype(np.intp) - 1
+
+    return (np.maximum(columns, 0), columns < 0)
+
+
+def values_at(
+    columns: np.ndarray, before: np.ndarray, include_delay: bool = False
+) -> Float64Array:
+    """# `tdbear.analyzer.curves.values_at()`
+
+    `(..., n_times, n_attrs)` values from `columns`, the
+    `(..., n_attrs + 1, n_times)` columns of the data at each time
+    (the first column where `before` is set). At the start of the trial
+    (`before`), only the delay is `1.0`. The delay is the last column
+    of the result if `include_delay` is set.
+    """
+
+    height: int = columns.shape[-2] if include_delay else columns.shape[-2] - 1
+    values: Float64Array = np.moveaxis(columns[..., :height, :], -1, -2).astype(
+        np.float64
+    )
+
+    if before.any():
+        values[..., before, :] = 0.0
+
+        if include_delay:
+            values[..., before, -1] = 1.0
+
+    return values
@@ -0,0 +1,3 @@
+from ..distance.pairwise_distances import pairwise_distances
+
+__all__ = ["pairwise_distances"]
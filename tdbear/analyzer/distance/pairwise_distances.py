@@ -0,0 +1,149 @@
+from __future__ import annotations
+from typing import Callable, Iterable
+import concurrent.futures
+import itertools
+import math
+
+import numpy as np
+
+from ..._util import Float64Array
+from ..curves import TDSCurve, TDSTensor
+from ..curves.dtype_policy import DtypePolicy
+from ..curves.stacking import stack_curves
+
+
+# bytes of the per-time distances of a tile held in memory at a time
+_CHUNK_BYTES: int = 2**26
+
+
+def pairwise_distances(
+    tds_curves: Iterable[TDSCurve],
+    metric: str | Callable[[TDSCurve, TDSCurve], float] = "euclidean",
+    *,
+    square: bool = False,
+    workers: int | None = None,
+) -> Float64Array:
+    """# `tdbear.analyzer.pairwise_distances()`
+
+    Distances between all pairs of curves.
+
+    ## Args
+    - `tds_curves` : Curves with the same attributes and resolution,
+                     e.g. a `TDSContainer` or a `TDSTensor`.
+    - `metric`     : `"euclidean"` for the metric of `TDSCurve.distance()`
+                     (the mean over time of the Euclidean distance between
+                     the columns, divided by `2 ** 0.5`), or a function
+                     taking two curves. `"euclidean"` is computed with
+                     matrix products over square tiles of pairs, and
+                     as the fraction of time points where the selected
+                     attributes differ if all curves are single trials.
+                     Defaults to `"euclidean"`.
+    - `square`     : Set this `True` to return the `(n, n)` matrix instead
+                     of the condensed vector of the upper triangle
+                     (in the order of `scipy.spatial.distance.pdist`).
+                     Defaults to `False`.
+    - `workers`    : Number of threads computing tiles in parallel.
+                     Tiles are computed serially if this is `None` or `1`.
+                     Defaults to `None`.
+
+    ## Returns
+    - `Float64Array` : Condensed vector of length `n * (n - 1) // 2`,
+                       or the `(n, n)` matrix if `square` is `True`.
+
+    ## Throws
+    - `ValueError` : Thrown when `metric` is unknown or the curves mix
+                     different attributes or resolutions.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    dataset = ta.load_dir("./nanakoberry/**/")
+    matrix = ta.pairwise_distances(dataset, square=True, workers=4)
+    ```
+    """
+
+    curves: TDSTensor | list[TDSCurve] = (
+        tds_curves if isinstance(tds_curves, TDSTensor) else [*tds_curves]
+    )
+    n: int = len(curves)
+    matrix: Float64Array = np.zeros((n, n), DtypePolicy.accumulator)
+
+    if callable(metric):
+        for (i, j) in itertools.combinations(range(n), 2):
+            matrix[i, j] = matrix[j, i] = metric(curves[i], curves[j])
+
+    elif metric != "euclidean":
+        raise ValueError(f'Unknown metric "{metric}".')
+
+    elif n > 1:
+        (stacked, _) = stack_curves(curves)
+        (_, height, width) = stacked.shape
+
+        tile: Callable[[slice, slice], Float64Array]
+
+        if _one_hot(stacked):
+            # only the selected attribute of each column is relevant
+            selected: np.ndarray = stacked.argmax(1).astype(
+                np.uint8 if height <= 256 else np.intp
+            )
+
+            def tile(rows: slice, columns: slice) -> Float64Array:
+                return (selected[rows, None] != selected[None, columns]).mean(
+                    2, DtypePolicy.accumulator
+                )
+
+        else:
+            # time-major layout, so that each time point is one matrix
+            columns_all: Float64Array = np.ascontiguousarray(
+                stacked.transpose(2, 0, 1), DtypePolicy.accumulator
+            )
+            norms: Float64Array = np.square(columns_all).sum(2)
+
+            def tile(rows: slice, columns: slice) -> Float64Array:
+                # |x - y|^2 = |x|^2 + |y|^2 - 2 x.y at each time point
+                squared: Float64Array = columns_all[:, rows] @ columns_all[
+                    :, columns
+                ].transpose(0, 2, 1)
+                squared *= -2
+                squared += norms[:, rows, None]
+                squared += norms[:, None, columns]
+
+                np.maximum(squared, 0.0, squared)
+                squared /= 2
+
+                return np.sqrt(squared, squared).mean(0)
+
+        size: int = max(1, math.isqrt(_CHUNK_BYTES // (width * 8)))
+        bounds: list[slice] = [slice(i, i + size) for i in range(0, n, size)]
+        pairs: list[tuple[slice, slice]] = [
+            (a, b) for (i, a) in enumerate(bounds) for b in bounds[i:]
+        ]
+
+        def fill(pair: tuple[slice, slice]) -> None:
+            (rows, columns) = pair
+            distances: Float64Array = tile(rows, columns)
+
+            if rows == columns:
+                distances = np.triu(distances, 1)
+                distances += distances.T
+
+            matrix[rows, columns] = distances
+            matrix[columns, rows] = distances.T
+
+        if workers is None or workers <= 1 or len(pairs) <= 1:
+            for pair in pairs:
+                fill(pair)
+
+        else:
+            with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+                for _ in executor.map(fill, pairs):
+                    pass
+
+    return matrix if square else matrix[np.triu_indices(n, 1)]
+
+
+def _one_hot(stacked: np.ndarray) -> bool:
+    return bool(
+        ((stacked == 0) | (stacked == 1)).all() and (stacked.sum(1) == 1).all()
+    )
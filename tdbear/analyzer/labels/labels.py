@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Iterable, Iterator, Self, overload
+from typing import Iterable, Iterator, Self, Any, overload
 from functools import cache
 
 
@@ -10,6 +10,30 @@ class Labels:
     def get_instance(cls, labels: Iterable[str], /) -> Self:
         return cls.__get_instances(labels if isinstance(labels, tuple) else (*labels,))
 
+    @classmethod
+    def union(cls, *labels: Iterable[str]) -> Self:
+        """# `tdbear.analyzer.Labels.union()`
+
+        Sorted labels of the words in any of `labels`,
+        in the same order as those of loaded curves.
+        """
+
+        return cls.get_instance(sorted({word for keys in labels for word in keys}))
+
+    @classmethod
+    def intersection(cls, *labels: Iterable[str]) -> Self:
+        """# `tdbear.analyzer.Labels.intersection()`
+
+        Sorted labels of the words in all of `labels`.
+        """
+
+        if not labels:
+            return cls.get_instance(())
+
+        words: set[str] = {*labels[0]}.intersection(*labels[1:])
+
+        return cls.get_instance(sorted(words))
+
     @classmethod
     @cache
     def __get_instances(cls, keys: tuple[str, ...], /) -> Self:
@@ -37,6 +61,9 @@ class Labels:
     def __iter__(self, /) -> Iterator[str]:
         return self.__vals.__iter__()
 
+    def __contains__(self, key: object, /) -> bool:
+        return key in self.__vals
+
     def __len__(self, /) -> int:
         return len(self.__vals)
 
@@ -46,5 +73,8 @@ class Labels:
     def __ne__(self, other: Self, /) -> bool:
         return not (self.__keys == other.__keys)
 
+    def __reduce__(self, /) -> tuple[Any, tuple[tuple[str, ...]]]:
+        return (Labels.get_instance, (self.__keys,))
+
     def __repr__(self, /) -> str:
         return self.__vals.__repr__()
@@ -1,12 +1,16 @@
 from __future__ import annotations
-from typing import Mapping, Any
+from typing import Callable, Hashable, Mapping, Iterable, Iterator, Any
+import concurrent.futures
+import functools
 import glob
-import itertools
 
-import matplotlib.pyplot as plt
+from numpy.typing import DTypeLike
 
-from .._util import Console
-from .curves import TDSContainer
+from .._util import Console, pyplot
+from .curves import TDSCurve, TDSContainer, TDSAccumulator, meta_filter
+from .curves.meta_table import Query
+from .curves.tds_reader import read_records
+from .cache import DiscretizationCache
 
 
 def load_dir(
@@ -14,6 +18,15 @@ def load_dir(
     file_extension: str = ".yml",
     resolution: int = 1000,
     print_status: bool = True,
+    *,
+    workers: int | None = None,
+    use_threads: bool = False,
+    errors: dict[str, Exception] | None = None,
+    cache: DiscretizationCache | str | None = None,
+    lazy: bool = False,
+    compact: bool = False,
+    dtype: DTypeLike | None = None,
+    where: Query | None = None,
 ) -> TDSContainer:
     """# `tdbear.analyzer.load_dir()`
 
@@ -28,10 +41,42 @@ def load_dir(
                          duration (start to stop). Defaults to `1000`.
     - `print_status`   : Set this `True` to indicate which file
                          is being loaded. Defaults to `True`.
+    - `workers`        : Number of worker processes loading files in
+                         parallel. Files are loaded serially if this is
+                         `None` or `1`. Defaults to `None`.
+    - `use_threads`    : Set this `True` to use a thread pool instead of
+                         a process pool. Defaults to `False`.
+    - `errors`         : If a dict is given, files that fail to load are
+                         skipped and their exceptions are stored in it,
+                         keyed by file path. Otherwise the first failure
+                         is raised. Defaults to `None`.
+    - `cache`          : A `DiscretizationCache` (or the path to its
+                         directory) used to skip parsing files that have
+                         not changed since they were last loaded.
+                         Defaults to `None`.
+    - `lazy`           : Set this `True` to discretize each curve on
+                         the first access to its data, so that operations
+                         on metadata only (`filter`, `group_by`, etc.)
+                         stay cheap. Lazy curves are not written to
+                         the cache. Defaults to `False`.
+    - `compact`        : Set this `True` to store the data of each curve
+                         in the run-length encoded form, which takes
+                         a fraction of the memory of the dense array.
+                         Defaults to `False`.
+    - `dtype`          : dtype of the data (e.g. `np.bool_` or
+                         `np.float32`). Defaults to `DtypePolicy.trial`.
+    - `where`          : Conditions on the metadata of the records
+                         (see `meta_filter()`). Records that do not match
+                         are not discretized, and with `cache`, files
+                         without any matching record are not even read.
+                         It must be picklable when `workers` use processes.
+                         Defaults to `None`.
 
     ## Returns
     - `TDSContainer` : A list-like object that contains multiple
-                       `TDSCurve` objects.
+                       `TDSCurve` objects, in the sorted order of file paths.
+                       It is empty only if `where` matches no record,
+                       or if every file failed to load into `errors`.
 
     ## Throws
     - `FileNotFoundError` : Thrown when no file is found.
@@ -42,33 +87,267 @@ def load_dir(
     import tdbear.analyzer as ta
 
     dataset = ta.load_dir("./nanakoberry/**/")
+
+    failures = {}
+    dataset = ta.load_dir("./nanakoberry/**/", workers=8, errors=failures)
+
+    dataset = ta.load_dir(
+        "./nanakoberry/**/",
+        cache=".tdbear_cache",
+        where={"PRODUCT": "strawberry", "ASSESSOR": {"PA", "PB"}},
+    )
+    ```
+    """
+
+    files: list[str] = _list_files(dir_path, file_extension, print_status)
+    loader: functools.partial[TDSContainer | Exception] = _loader(
+        resolution, errors, cache, lazy=lazy, compact=compact, dtype=dtype, where=where
+    )
+
+    results: Iterable[TDSContainer | Exception]
+    obj: TDSContainer = TDSContainer()
+
+    if not files:
+        raise FileNotFoundError("Directory seems to be empty.")
+
+    if workers is None or workers <= 1 or len(files) <= 1:
+        for result in _collect(files, map(loader, files), errors, print_status):
+            obj += result
+
+    else:
+        executor: concurrent.futures.Executor = (
+            concurrent.futures.ThreadPoolExecutor(workers)
+            if use_threads
+            else concurrent.futures.ProcessPoolExecutor(workers)
+        )
+
+        with executor:
+            results = executor.map(
+                loader, files, chunksize=max(1, len(files) // (workers * 4))
+            )
+
+            for result in _collect(files, results, errors, print_status):
+                obj += result
+
+    return obj
+
+
+def iter_dir(
+    dir_path: str = ".",
+    file_extension: str = ".yml",
+    resolution: int = 1000,
+    print_status: bool = True,
+    *,
+    errors: dict[str, Exception] | None = None,
+    cache: DiscretizationCache | str | None = None,
+    compact: bool = False,
+    dtype: DTypeLike | None = None,
+    where: Query | None = None,
+) -> Iterator[TDSCurve]:
+    """# `tdbear.analyzer.iter_dir()`
+
+    Yields `TDSCurve` objects from files in the specified directory(s),
+    loading one file at a time. Arguments are the same as those of
+    `load_dir()`.
+
+    ## Returns
+    - `Iterator[TDSCurve]` : Curves in the sorted order of file paths.
+
+    ## Throws
+    - `FileNotFoundError` : Thrown when no file is found.
+    - `OSError`           : Thrown when an error occurs while opening the file.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    for curve in ta.iter_dir("./nanakoberry/**/"):
+        print(curve.get_meta("ASSESSOR"))
+    ```
+    """
+
+    files: list[str] = _list_files(dir_path, file_extension, print_status)
+    loader: functools.partial[TDSContainer | Exception] = _loader(
+        resolution, errors, cache, compact=compact, dtype=dtype, where=where
+    )
+
+    if not files:
+        raise FileNotFoundError("Directory seems to be empty.")
+
+    for result in _collect(files, map(loader, files), errors, print_status):
+        yield from result
+
+
+def merge_dir(
+    dir_path: str = ".",
+    file_extension: str = ".yml",
+    resolution: int = 1000,
+    print_status: bool = True,
+    *,
+    group_by: str | Callable[[TDSCurve], Hashable] | None = None,
+    errors: dict[str, Exception] | None = None,
+    cache: DiscretizationCache | str | None = None,
+    dtype: DTypeLike | None = None,
+    where: Query | None = None,
+) -> TDSCurve | dict[Hashable, TDSCurve]:
+    """# `tdbear.analyzer.merge_dir()`
+
+    Merges the records in the specified directory(s) without keeping
+    them in memory. Each record is added to a running sum
+    (`TDSAccumulator`) as soon as it is read, so only one array per
+    group is kept. The result is the same as that of
+    `load_dir(...).merge()`, or of `merge()` on each group of
+    `load_dir(...).group_by(group_by)`.
+
+    ## Args
+    - `dir_path`       : Directory path (not the file path).
+                         You can use glob pattern. Defaults to ".".
+    - `file_extension` : File extension. Defaults to ".yml".
+    - `resolution`     : Number of discretized interval of the entire
+                         duration (start to stop). Defaults to `1000`.
+    - `print_status`   : Set this `True` to indicate which file
+                         is being loaded. Defaults to `True`.
+    - `group_by`       : Metadata key or function by which records
+                         are grouped. Defaults to `None` (no grouping).
+    - `errors`         : Same as that of `load_dir()`.
+    - `cache`          : Same as that of `load_dir()`.
+    - `dtype`          : dtype of the merged data.
+                         Defaults to `DtypePolicy.curve`.
+    - `where`          : Same as that of `load_dir()`.
+
+    ## Returns
+    - `TDSCurve`                : Merged curve if `group_by` is `None`.
+    - `dict[Hashable, TDSCurve]` : Merged curve of each group otherwise.
+
+    ## Throws
+    - `FileNotFoundError` : Thrown when no file is found.
+    - `OSError`           : Thrown when an error occurs while opening the file.
+    - `ValueError`        : Thrown when records of different attributes
+                            or resolutions are merged, or when no record
+                            is loaded because `where` matches none or
+                            every file failed to load into `errors`.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    merged = ta.merge_dir("./nanakoberry/**/")
+    products = ta.merge_dir("./nanakoberry/**/", group_by="PRODUCT")
     ```
     """
 
+    group_func: Callable[[TDSCurve], Hashable] | None = (
+        functools.partial(TDSCurve.get_meta, key=group_by)
+        if isinstance(group_by, str)
+        else group_by
+    )
+    accumulators: dict[Hashable, TDSAccumulator] = {}
+    n_errors: int = 0 if errors is None else len(errors)
+
+    for curve in iter_dir(
+        dir_path,
+        file_extension,
+        resolution,
+        print_status,
+        errors=errors,
+        cache=cache,
+        compact=True,
+        where=where,
+    ):
+        key: Hashable = None if group_func is None else curve @ group_func
+
+        if key not in accumulators:
+            accumulators[key] = TDSAccumulator()
+
+        accumulators[key].add(curve)
+
+    if not accumulators and where is not None:
+        raise ValueError("No record matches the conditions.")
+
+    if not accumulators and errors is not None and len(errors) > n_errors:
+        raise ValueError(
+            f"Every file failed to load: {', '.join(map(repr, [*errors][n_errors:]))}"
+        )
+
+    if not accumulators:
+        raise FileNotFoundError("Directory seems to be empty.")
+
+    if group_func is None:
+        return accumulators[None].result(dtype)
+
+    return {k: v.result(dtype) for (k, v) in accumulators.items()}
+
+
+def _list_files(dir_path: str, file_extension: str, print_status: bool) -> list[str]:
     dir_path = dir_path.replace("\\", "/")
 
     if print_status:
         Console.log(("Loading ", Console.CYAN), (f'"{dir_path}"', Console.MAGENTA))
 
-    files: list = glob.glob(f"{dir_path}/*{file_extension}", recursive=True)
+    return sorted(glob.glob(f"{dir_path}/*{file_extension}", recursive=True))
 
-    obj: TDSContainer = TDSContainer(
-        itertools.chain.from_iterable(
-            itertools.starmap(
-                load_file,
-                zip(files, itertools.repeat(resolution), itertools.repeat(False)),
-            )
-        )
+
+def _loader(
+    resolution: int,
+    errors: dict[str, Exception] | None,
+    cache: DiscretizationCache | str | None,
+    **kwargs: Any,
+) -> functools.partial[TDSContainer | Exception]:
+    return functools.partial(
+        _load_file if errors is None else _try_load_file,
+        resolution=resolution,
+        cache=DiscretizationCache(cache) if isinstance(cache, str) else cache,
+        **kwargs,
     )
 
-    if not len(obj):
-        raise FileNotFoundError("Directory seems to be empty.")
 
-    return obj
+def _load_file(file_path: str, resolution: int, **kwargs: Any) -> TDSContainer:
+    return load_file(file_path, resolution, False, **kwargs)
+
+
+def _try_load_file(
+    file_path: str, resolution: int, **kwargs: Any
+) -> TDSContainer | Exception:
+    try:
+        return load_file(file_path, resolution, False, **kwargs)
+    except Exception as e:
+        return e
+
+
+def _collect(
+    files: Iterable[str],
+    results: Iterable[TDSContainer | Exception],
+    errors: dict[str, Exception] | None,
+    print_status: bool,
+) -> Iterator[TDSContainer]:
+    for (file_path, result) in zip(files, results):
+        if isinstance(result, Exception):
+            if errors is None:
+                raise result
+
+            errors[file_path] = result
+
+            if print_status:
+                Console.log(
+                    ("Skipped ", Console.YELLOW),
+                    (f'"{file_path}"', Console.MAGENTA),
+                    f": {result}",
+                )
+
+        else:
+            yield result
 
 
 def load_file(
-    file_path: str, resolution: int = 1000, print_status: bool = True
+    file_path: str,
+    resolution: int = 1000,
+    print_status: bool = True,
+    *,
+    cache: DiscretizationCache | str | None = None,
+    lazy: bool = False,
+    compact: bool = False,
+    dtype: DTypeLike | None = None,
+    where: Query | None = None,
 ) -> TDSContainer:
     """# `tdbear.analyzer.load_file()`
 
@@ -81,6 +360,23 @@ def load_file(
                               duration (start to stop). Defaults to `1000`.
     - `print_status` : Set this `True` to indicate which file
                               is being loaded. Defaults to `True`.
+    - `cache`        : A `DiscretizationCache` (or the path to its
+                       directory) used to skip parsing the file if it
+                       has not changed since it was last loaded. Every
+                       record of a parsed file is discretized into it,
+                       even those `where` does not match, unless `lazy`
+                       is set. Defaults to `None`.
+    - `lazy`         : Set this `True` to discretize each curve on
+                       the first access to its data. Lazy curves are not
+                       written to the cache. Defaults to `False`.
+    - `compact`      : Set this `True` to store the data of each curve
+                       in the run-length encoded form. Defaults to `False`.
+    - `dtype`        : dtype of the data (e.g. `np.bool_` or `np.float32`).
+                       Defaults to `DtypePolicy.trial`.
+    - `where`        : Conditions on the metadata of the records
+                       (see `meta_filter()`). Records that do not match
+                       are not discretized, and with `cache`, the file is
+                       not read if no record matches. Defaults to `None`.
 
     ## Returns
     - `TDSContainer` : A list-like object that contains multiple
@@ -102,8 +398,46 @@ def load_file(
     if print_status:
         Console.log(("Loading ", Console.CYAN), (f'"{file_path}"', Console.MAGENTA))
 
+    obj: TDSContainer | None
+
+    if isinstance(cache, str):
+        cache = DiscretizationCache(cache)
+
+    if cache is not None:
+        if where is not None:
+            metas: list[dict[str, list[Any]]] | None = cache.load_meta(file_path)
+
+            if metas is not None and not any(map(meta_filter(where), metas)):
+                return TDSContainer()
+
+        obj = cache.load(file_path, resolution, compact, dtype, where, lazy)
+
+        if obj is not None:
+            return obj
+
     with open(file_path, "r", encoding="UTF-8", newline="\n") as f:
-        return TDSContainer.from_yaml(f, resolution)
+        records: list[dict[str, Any]] = [*read_records(f)]
+
+    if cache is None or lazy:
+        obj = TDSContainer.from_records(
+            records, resolution, lazy, compact, dtype, where
+        )
+
+    else:
+        # the file is parsed anyway, so the entry holds every record
+        # and serves later loads whatever their conditions
+        obj = TDSContainer.from_records(records, resolution, False, compact, dtype)
+        cache.store(file_path, resolution, obj)
+
+        if where is not None:
+            predicate: Callable[[dict[str, list[Any]]], bool] = meta_filter(where)
+            obj = obj.filter(lambda c: predicate(c.meta))
+
+    if cache is not None and lazy:
+        # only the metadata, so that later queries can skip the file
+        cache.store_meta(file_path, [record["meta"] for record in records])
+
+    return obj
 
 
 def repl(locals: Mapping[str, Any] | None = None, filename: str = "<console>") -> None:
@@ -145,4 +479,4 @@ def show(*args, **kwargs):
     ```
     """
 
-    return plt.show(*args, **kwargs)
+    return pyplot().show(*args, **kwargs)
@@ -1,3 +1,4 @@
 from ..pca.pca import PCA
+from ..pca.features import extract_features
 
-__all__ = ["PCA"]
+__all__ = ["PCA", "extract_features"]
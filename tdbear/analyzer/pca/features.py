@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Callable, Iterable, Sequence, TypeAlias
+
+import numpy as np
+
+from ..._util import Float64Array
+from ..curves import TDSCurve
+from ..curves.resampling import resample_data
+from ..labels import Labels
+
+
+DataExtractor: TypeAlias = "str | Callable[[TDSCurve], Iterable[float]]"
+
+"""names of the built-in extractors"""
+EXTRACTORS: tuple[str, ...] = ("dominance_duration", "curve", "window_mean")
+
+# bytes of the curves stacked at a time
+_CHUNK_BYTES: int = 2**24
+
+
+def extract_features(
+    tds_curves: Sequence[TDSCurve], extractor: DataExtractor, windows: int = 10
+) -> Float64Array:
+    """# `tdbear.analyzer.pca.extract_features()`
+
+    `(n_curves, n_features)` matrix of the features of the curves.
+    Built-in extractors ignore the delay row. `"curve"` and
+    `"window_mean"` are computed as one reduction over chunks of
+    the stacked data, and `"dominance_duration"` from the row sums of
+    each curve, which compact curves have without expanding their data:
+
+    - `"dominance_duration"` : Proportion of time each attribute is
+                               dominant (`Curve.dominance_duration`).
+    - `"curve"`              : The data of all attributes, flattened.
+    - `"window_mean"`        : Means of each attribute over `windows`
+                               equal windows of time.
+
+    Otherwise `extractor` is called for each curve.
+    """
+
+    if callable(extractor):
+        return np.array([*map(extractor, tds_curves)], np.float64)
+
+    if extractor not in EXTRACTORS:
+        raise ValueError(f'Unknown data extractor "{extractor}".')
+
+    if not len(tds_curves):
+        return np.empty((0, 0), np.float64)
+
+    if extractor == "dominance_duration":
+        return np.array([c.dominance_duration[:-1] for c in tds_curves], np.float64)
+
+    (height, width) = tds_curves[0].data.shape
+    step: int = max(1, _CHUNK_BYTES // (height * width * 8))
+    features: list[Float64Array] = []
+
+    for i in range(0, len(tds_curves), step):
+        block: np.ndarray = np.stack([c.data for c in tds_curves[i : i + step]])
+        attrs: np.ndarray = block[:, :-1]
+
+        if extractor == "curve":
+            features.append(attrs.reshape(len(attrs), -1))
+        else:
+            features.append(
+                resample_data(attrs, windows, "mean", dtype=np.float64).reshape(
+                    len(attrs), -1
+                )
+            )
+
+    return np.concatenate(features).astype(np.float64, copy=False)
+
+
+def feature_labels(
+    attr_nums: Labels, extractor: str, resolution: int, windows: int = 10
+) -> Labels:
+    """# `tdbear.analyzer.pca.feature_labels()`
+
+    Labels of the features of a built-in extractor, e.g. `"SWEET"` for
+    `"dominance_duration"` and `"SWEET[3]"` (the fourth column or window)
+    otherwise.
+    """
+
+    if extractor == "dominance_duration":
+        return attr_nums
+
+    count: int = resolution if extractor == "curve" else windows
+
+    return Labels.get_instance(
+        [f"{attr}[{i}]" for attr in attr_nums for i in range(count)]
+    )
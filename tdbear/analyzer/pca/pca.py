@@ -1,65 +1,329 @@
 from __future__ import annotations as __anotations
-from typing import Callable, Iterable, overload
+from typing import Callable, Iterable, Iterator, Sequence, Any, overload, TYPE_CHECKING
+import itertools
+import operator
 
 import numpy as np
-from sklearn import decomposition
 
 from ..._util import Float64Array
 from ..curves import TDSCurve
 from ..labels import Labels
+from .features import DataExtractor, extract_features, feature_labels
 from .pca_result import PCAResult
 
+if TYPE_CHECKING:
+    from sklearn import decomposition
+
 
 class PCA:
-    """# `tdbear.analyzer.PCA`"""
+    """# `tdbear.analyzer.PCA`
+
+    With `cache=True`, the feature matrix of the last fit is reused when
+    the same curves are fitted again (e.g. with other `n_components`).
+    The curves are identified by the objects only, so the cache is not
+    valid once their data is modified (e.g. by `smooth()` or `fix()`).
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    dataset = ta.load_dir("./nanakoberry/**/")
+    pca = ta.PCA(2)
+    result = pca.fit(dataset, data_extractor="window_mean", windows=10)
+    result3 = pca.fit(
+        dataset, data_extractor="window_mean", n_components=3, cache=True
+    )
+    ```
+    """
 
     @overload
-    def __init__(self, n_components: int = 2, /):
+    def __init__(
+        self,
+        n_components: int = 2,
+        /,
+        *,
+        svd_solver: str = "auto",
+        random_state: int | None = None,
+    ):
         ...
 
     @overload
-    def __init__(self, model: decomposition.PCA, /):
+    def __init__(self, model: decomposition.PCA | decomposition.IncrementalPCA, /):
         ...
 
-    def __init__(self, arg1: int | decomposition.PCA = 2, /):
+    def __init__(
+        self,
+        arg1: int | decomposition.PCA | decomposition.IncrementalPCA = 2,
+        /,
+        *,
+        svd_solver: str = "auto",
+        random_state: int | None = None,
+    ):
+        """# `tdbear.analyzer.PCA()`
 
-        self.model: decomposition.PCA
+        ## Args
+        - `n_components` : Number of components. Defaults to `2`.
+        - `svd_solver`   : `svd_solver` of `sklearn.decomposition.PCA`.
+                           `"randomized"` is much faster when there are
+                           many features (e.g. `data_extractor="curve"`)
+                           and few components. Defaults to `"auto"`.
+        - `random_state` : Seed of the randomized solver.
+                           Defaults to `None`.
+        """
+
+        self.model: decomposition.PCA | decomposition.IncrementalPCA
         self.tds_curves: tuple[TDSCurve, ...] = tuple()
         self.labels: Labels = Labels.get_instance([])
 
+        self.__features: tuple[tuple[Any, ...], Float64Array] | None = None
+
         if isinstance(arg1, int):
-            self.model = decomposition.PCA(arg1)
+            from sklearn import decomposition
+
+            self.model = decomposition.PCA(
+                arg1, svd_solver=svd_solver, random_state=random_state
+            )
         else:
             self.model = arg1
 
     def fit(
         self,
-        tds_curves: Iterable[TDSCurve],
+        tds_curves: Iterable[TDSCurve] | Callable[[], Iterable[TDSCurve]],
         *,
-        data_extractor: Callable[
-            [TDSCurve], Iterable[float]
-        ] = lambda e: e.dominance_duration[:-1],
+        data_extractor: DataExtractor = "dominance_duration",
         standardize: bool = True,
         labels: Labels | None = None,
+        chunk_size: int | None = None,
+        windows: int = 10,
+        n_components: int | None = None,
+        cache: bool = False,
     ) -> PCAResult:
+        """# `tdbear.analyzer.PCA.fit()`
+
+        ## Args
+        - `tds_curves`     : Curves to analyze, or a function returning
+                             a new iterable of them each time it is called
+                             (e.g. `lambda: ta.iter_dir("./data/**/")`).
+        - `data_extractor` : Name of a built-in extractor
+                             (`"dominance_duration"`, `"curve"` or
+                             `"window_mean"`, see `extract_features()`),
+                             or a function returning the features of
+                             a curve. Defaults to `"dominance_duration"`.
+        - `standardize`    : Set this `True` to standardize each feature.
+                             Features of zero variance (e.g. attributes
+                             that are never selected) are only centered.
+                             Defaults to `True`.
+        - `labels`         : Labels of the features. Defaults to
+                             the attributes of the first curve for
+                             `"dominance_duration"` and functions, and to
+                             `"ATTRIBUTE[i]"` for the other extractors.
+        - `chunk_size`     : Set this to fit an
+                             `sklearn.decomposition.IncrementalPCA` on
+                             chunks of this many curves, so that the
+                             whole feature matrix is never in memory.
+                             The curves are then read three times
+                             (standardization statistics, fitting and
+                             scores), so a function should be given
+                             instead of a one-shot iterator, and
+                             `result.tds_curves` is left empty unless
+                             `tds_curves` is a sequence. The model of this
+                             object is then replaced by the fitted
+                             `IncrementalPCA` if it is not one. This is
+                             implied if the model is an `IncrementalPCA`,
+                             whose `batch_size` is used by default.
+                             Defaults to `None`.
+        - `windows`        : Number of windows of `"window_mean"`.
+                             Defaults to `10`.
+        - `n_components`   : Set this to change the number of components
+                             of the model before fitting.
+                             Defaults to `None`.
+        - `cache`          : Set this `True` to reuse the features of
+                             the last fit if the curves (the same objects)
+                             and the options are the same. Changes to the
+                             data of the curves are not detected, so this
+                             is only valid for curves left unchanged since
+                             the last fit. Defaults to `False`.
+        """
+
+        from sklearn import decomposition
+
+        if n_components is not None:
+            self.model.set_params(n_components=n_components)
+
+        if chunk_size is None and isinstance(self.model, decomposition.IncrementalPCA):
+            chunk_size = self.model.batch_size or 1000
+
+        if chunk_size is not None:
+            return self.__fit_chunks(
+                tds_curves, data_extractor, standardize, labels, chunk_size, windows
+            )
 
         result = PCAResult()
-        result.tds_curves = (*tds_curves,)
+        result.tds_curves = (
+            *(tds_curves() if callable(tds_curves) else tds_curves),
+        )
+
+        if not result.tds_curves:
+            raise ValueError("No curve to analyze.")
+
+        first: TDSCurve = result.tds_curves[0]
+
+        if labels is not None:
+            result.labels = labels
+        elif callable(data_extractor):
+            result.labels = first.attr_nums
+        else:
+            result.labels = feature_labels(
+                first.attr_nums, data_extractor, first.resolution, windows
+            )
+
+        key: tuple[Any, ...] = (data_extractor, standardize, windows)
+        data: Float64Array
+
+        if (
+            cache
+            and self.__features is not None
+            and self.__features[0] == key
+            and len(self.tds_curves) == len(result.tds_curves)
+            and all(map(operator.is_, self.tds_curves, result.tds_curves))
+        ):
+            data = self.__features[1]
 
-        if labels is None:
-            result.labels = result.tds_curves[0].attr_nums
         else:
+            data = extract_features(result.tds_curves, data_extractor, windows)
+
+            if standardize:
+                data = (data - data.mean(0)) / _scale(data.std(0))
+
+            self.__features = (key, data)
+
+        self.tds_curves = result.tds_curves
+        self.labels = result.labels
+
+        result.scores = self.model.fit(data).transform(data).T
+        self.__set_attributes(result, self.model)
+
+        return result
+
+    def __fit_chunks(
+        self,
+        tds_curves: Iterable[TDSCurve] | Callable[[], Iterable[TDSCurve]],
+        data_extractor: DataExtractor,
+        standardize: bool,
+        labels: Labels | None,
+        chunk_size: int,
+        windows: int,
+    ) -> PCAResult:
+
+        from sklearn import decomposition
+
+        model: decomposition.IncrementalPCA = (
+            self.model
+            if isinstance(self.model, decomposition.IncrementalPCA)
+            else decomposition.IncrementalPCA(
+                self.model.n_components, whiten=self.model.whiten
+            )
+        )
+
+        if not callable(tds_curves) and iter(tds_curves) is tds_curves:
+            raise ValueError(
+                "Curves are read several times; "
+                "give a sequence or a function returning an iterable."
+            )
+
+        def source() -> Iterator[TDSCurve]:
+            curves: Iterable[TDSCurve] = (
+                tds_curves() if callable(tds_curves) else tds_curves
+            )
+            return iter(curves)
+
+        def chunks() -> Iterator[Float64Array]:
+            it: Iterator[TDSCurve] = source()
+
+            while chunk := [*itertools.islice(it, chunk_size)]:
+                yield extract_features(chunk, data_extractor, windows)
+
+        result = PCAResult()
+        result.tds_curves = (
+            (*tds_curves,) if isinstance(tds_curves, Sequence) else tuple()
+        )
+
+        first: TDSCurve | None = next(source(), None)
+
+        if first is None:
+            raise ValueError("No curve to analyze.")
+
+        if labels is not None:
             result.labels = labels
+        elif callable(data_extractor):
+            result.labels = first.attr_nums
+        else:
+            result.labels = feature_labels(
+                first.attr_nums, data_extractor, first.resolution, windows
+            )
 
-        data: Float64Array = np.array([*map(data_extractor, result.tds_curves)])
+        # the first pass: mean and standard deviation of each feature,
+        # combining the statistics of the chunks
+        (count, mean, m2) = (0, np.float64(0.0), np.float64(0.0))
 
         if standardize:
-            data = (data - data.mean(0)) / data.std(0)
+            for data in chunks():
+                (n, chunk_mean) = (len(data), data.mean(0))
+                delta: Float64Array = chunk_mean - mean
+                total: int = count + n
 
-        result.scores = self.model.fit(data).transform(data).T
-        result.components = getattr(self.model, "components_")
-        result.variance = getattr(self.model, "explained_variance_")
-        result.variance_ratio = getattr(self.model, "explained_variance_ratio_")
-        result.singular_values = getattr(self.model, "singular_values_")
+                m2 = m2 + ((data - chunk_mean) ** 2).sum(0)
+                m2 = m2 + delta**2 * count * n / total
+                mean = mean + delta * n / total
+                count = total
+
+        std: Float64Array = (
+            _scale(np.sqrt(m2 / count)) if standardize else np.float64(1.0)
+        )
+
+        # the second pass: fitting, in batches of at least n_components
+        # rows as IncrementalPCA requires
+        pending: Float64Array | None = None
+
+        for data in chunks():
+            data = (data - mean) / std
+
+            if pending is None:
+                pending = data
+            elif len(data) < (model.n_components or 1):
+                pending = np.concatenate([pending, data])
+            else:
+                model.partial_fit(pending)
+                pending = data
+
+        model.partial_fit(pending)
+
+        # the third pass: scores
+        result.scores = np.concatenate(
+            [model.transform((data - mean) / std) for data in chunks()]
+        ).T
+
+        # the features are not kept, so the next fit extracts them again
+        self.model = model
+        self.tds_curves = result.tds_curves
+        self.labels = result.labels
+        self.__features = None
+
+        self.__set_attributes(result, model)
 
         return result
+
+    @staticmethod
+    def __set_attributes(
+        result: PCAResult,
+        model: decomposition.PCA | decomposition.IncrementalPCA,
+    ) -> None:
+        result.components = getattr(model, "components_")
+        result.variance = getattr(model, "explained_variance_")
+        result.variance_ratio = getattr(model, "explained_variance_ratio_")
+        result.singular_values = getattr(model, "singular_values_")
+
+
+def _scale(std: Float64Array) -> Float64Array:
+    # features of zero variance are only centered
+    return np.where(std > 0.0, std, 1.0)
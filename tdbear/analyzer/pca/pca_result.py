@@ -1,14 +1,15 @@
 from __future__ import annotations
-from typing import Any
-
-import matplotlib.pyplot as plt
-import matplotlib.figure as figure
+from typing import Any, TYPE_CHECKING
 
 from ..analysis_result import AnalysisResult
 from ..curves import TDSCurve
 from ..labels import Labels
 
-from ..._util import Float64Array
+from ..._util import Float64Array, pyplot
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import matplotlib.figure as figure
 
 
 class PCAResult(AnalysisResult):
@@ -31,9 +32,19 @@ class PCAResult(AnalysisResult):
         scatter_args: dict[str, Any] = {},
         axes_args: dict[str, Any] = {},
         legend_args: dict[str, Any] = {},
+        *,
+        fig: figure.Figure | None = None,
     ) -> list[tuple[figure.Figure, plt.Axes]]:
+        """# `tdbear.analyzer.PCAResult.draw()`
+
+        Draws the scores of each pair of principal components on a new
+        pyplot figure, or, if `fig` is given, on a grid of subplots of it
+        (the pair of the `i`-th and `j`-th components on the row `j - 1`
+        and the column `i`).
+        """
 
         g: list[tuple[figure.Figure, plt.Axes]] = []
+        grid: int = len(self.scores) - 1
 
         for i in range(len(self.scores) - 1):
             for j in range(i + 1, len(self.scores)):
@@ -42,13 +53,25 @@ class PCAResult(AnalysisResult):
                 y: Float64Array = self.scores[j]
                 vr: Float64Array = self.variance_ratio
 
-                fig: figure.Figure = plt.figure()
-                ax: plt.Axes = fig.add_subplot(
-                    xlabel=f"PC{i + 1} ({round(vr[i] * 100)}%)",
-                    ylabel=f"PC{j + 1} ({round(vr[j] * 100)}%)",
-                )
+                title: str = f"PC{i + 1} and PC{j + 1}"
+                labels: dict[str, str] = {
+                    "xlabel": f"PC{i + 1} ({round(vr[i] * 100)}%)",
+                    "ylabel": f"PC{j + 1} ({round(vr[j] * 100)}%)",
+                }
+
+                ax: plt.Axes
+                target: figure.Figure
+
+                if fig is None:
+                    target = pyplot().figure()
+                    ax = target.add_subplot(**labels)
+                    target.suptitle(title)
 
-                fig.suptitle(f"PC{i + 1} and PC{j + 1}")
+                else:
+                    target = fig
+                    ax = fig.add_subplot(
+                        grid, grid, (j - 1) * grid + i + 1, title=title, **labels
+                    )
 
                 if show_scatter:
                     ax.scatter(x, y, **scatter_args)
@@ -64,9 +87,9 @@ class PCAResult(AnalysisResult):
                 if show_legend:
                     ax.legend(**legend_args)
 
-                g.append((fig, ax))
+                g.append((target, ax))
 
         if show:
-            plt.show()
+            pyplot().show()
 
         return g
@@ -0,0 +1,4 @@
+from ..permutation_test.permutation_test import PermutationTest
+from ..permutation_test.permutation_test_result import PermutationTestResult
+
+__all__ = ["PermutationTest", "PermutationTestResult"]
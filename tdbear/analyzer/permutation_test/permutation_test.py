@@ -0,0 +1,185 @@
+from __future__ import annotations
+from typing import Iterable, Any
+
+import numpy as np
+
+from ..._util import Float64Array
+from ..curves import TDSCurve, TDSTensor
+from ..curves.tds_curve import check_operable
+from ..curves.curve import normalize_columns
+from ..curves.dtype_policy import DtypePolicy
+from ..curves.stacking import stack_curves
+from .permutation_test_result import PermutationTestResult
+
+
+# bytes of the permuted difference curves held in memory at a time
+_CHUNK_BYTES: int = 2**26
+
+# statistics closer than this to the observed one count as ties
+_TOLERANCE: float = 1e-12
+
+
+class PermutationTest:
+    """# `tdbear.analyzer.PermutationTest`
+
+    Permutation test of the difference between the merged curves of
+    two groups of trials (e.g. two products), at each attribute and time.
+    The group labels of all trials are shuffled `n_permutations` times at
+    once, and the merged curves of all permutations are computed as
+    weighted sums over the stacked data, a block of permutations and
+    time points at a time.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    dataset = ta.load_dir("./nanakoberry/**/")
+    assessors = dataset.group_by("ASSESSOR")
+    result = ta.PermutationTest(5000, seed=0).fit(assessors["PA"], assessors["PB"])
+    result.draw()
+    ```
+    """
+
+    def __init__(
+        self,
+        n_permutations: int = 1000,
+        /,
+        *,
+        seed: int | np.random.SeedSequence | np.random.Generator | None = None,
+    ):
+        """# `tdbear.analyzer.PermutationTest()`
+
+        ## Args
+        - `n_permutations` : Number of random permutations.
+                             Defaults to `1000`.
+        - `seed`           : Seed of the random number generator, or the
+                             `numpy.random.Generator` itself. The same seed
+                             gives the same permutations. Defaults to `None`.
+        """
+
+        self.n_permutations: int = n_permutations
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+    def fit(
+        self,
+        first: Iterable[TDSCurve],
+        second: Iterable[TDSCurve],
+        *,
+        alternative: str = "two-sided",
+    ) -> PermutationTestResult:
+        """# `tdbear.analyzer.PermutationTest.fit()`
+
+        ## Args
+        - `first`       : Curves of the first group, e.g. a `TDSContainer`
+                          or a `TDSTensor`. Each curve is weighted by its
+                          number of trials, as in `TDSCurve.sum()`.
+        - `second`      : Curves of the second group, with the same
+                          attributes and resolution.
+        - `alternative` : `"two-sided"`, `"greater"` (the first group is
+                          dominant more often) or `"less"`.
+                          Defaults to `"two-sided"`.
+
+        ## Returns
+        - `PermutationTestResult` : The merged curves of the groups, their
+                                    difference and its p-values, without
+                                    and with the max-statistic correction
+                                    across time.
+
+        ## Throws
+        - `ValueError` : Thrown when either group is empty, `alternative`
+                         is unknown, or the curves mix different
+                         attributes or resolutions.
+        """
+
+        if alternative not in ("two-sided", "greater", "less"):
+            raise ValueError(f'Unknown alternative "{alternative}".')
+
+        groups: list[TDSTensor | list[TDSCurve]] = [
+            g if isinstance(g, TDSTensor) else [*g] for g in (first, second)
+        ]
+
+        if not all(map(len, groups)):
+            raise ValueError("No curve to compare.")
+
+        check_operable(groups[0][0], groups[1][0])
+
+        ((a, wa), (b, wb)) = map(stack_curves, groups)
+        stacked: np.ndarray = np.concatenate([a, b])
+        weights: Float64Array = np.concatenate([wa, wb])
+        labels: Float64Array = np.repeat(
+            np.array([1.0, 0.0], DtypePolicy.accumulator), (len(a), len(b))
+        )
+
+        result = PermutationTestResult()
+        (result.first, result.second) = (
+            g.merge() if isinstance(g, TDSTensor) else TDSCurve.sum(g) for g in groups
+        )
+        result.labels = result.first.attr_nums
+        result.alternative = alternative
+        result.n_permutations = self.n_permutations
+
+        (n, height, width) = stacked.shape
+        statistic: Any = {
+            "two-sided": np.abs,
+            "greater": np.positive,
+            "less": np.negative,
+        }[alternative]
+
+        result.difference = _differences(labels[None] * weights, weights, stacked)[0]
+        observed: Float64Array = statistic(result.difference) - _TOLERANCE
+
+        exceeded: np.ndarray = np.zeros((height, width), np.int64)
+        maxima: Float64Array = np.empty((self.n_permutations, height))
+        rows: int = max(1, min(_CHUNK_BYTES // (n * 8), self.n_permutations))
+        step: int = max(1, _CHUNK_BYTES // (rows * height * 8))
+
+        for p in range(0, self.n_permutations, rows):
+            assign: Float64Array = np.tile(
+                labels, (min(rows, self.n_permutations - p), 1)
+            )
+            self.rng.permuted(assign, axis=1, out=assign)
+            assign *= weights
+
+            m: Float64Array = maxima[p : p + len(assign)]
+            m[:] = -np.inf
+
+            for t in range(0, width, step):
+                s: Float64Array = statistic(
+                    _differences(assign, weights, stacked[..., t : t + step])
+                )
+
+                exceeded[:, t : t + step] += (s >= observed[:, t : t + step]).sum(0)
+                np.maximum(m, s.max(2), m)
+
+        result.p_values = (exceeded + 1) / (self.n_permutations + 1)
+
+        # how many permutations have a larger maximum across time
+        # than the observed statistic
+        exceeded = np.array(
+            [
+                len(x) - np.searchsorted(np.sort(x), o, "left")
+                for (x, o) in zip(maxima.T, observed)
+            ]
+        )
+        result.corrected_p_values = (exceeded + 1) / (self.n_permutations + 1)
+
+        return result
+
+
+def _differences(
+    assign: Float64Array, weights: Float64Array, tile: np.ndarray
+) -> Float64Array:
+    """Merged curves of the first group minus those of the second group
+    for each row of `assign` (the weight of each trial in the first group).
+    """
+
+    (n, height, width) = tile.shape
+    flat: Float64Array = tile.reshape(n, -1).astype(DtypePolicy.accumulator, copy=False)
+
+    first: Float64Array = (assign @ flat).reshape(-1, height, width)
+    second: Float64Array = (weights @ flat).reshape(height, width) - first
+
+    normalize_columns(first, first, 1)
+    normalize_columns(second, second, 1)
+
+    return np.subtract(first, second, first)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+
+import numpy as np
+
+from ..analysis_result import AnalysisResult
+from ..curves import TDSCurve
+from ..labels import Labels
+
+from ..._util import Float64Array, pyplot
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import matplotlib.figure as figure
+
+
+class PermutationTestResult(AnalysisResult):
+    """# `tdbear.analyzer.PermutationTestResult`
+
+    `difference`, `p_values` and `corrected_p_values` are
+    `(n_attrs + 1, resolution)` arrays in the same layout as
+    `TDSCurve.data`, the last row being the delay. `corrected_p_values`
+    compare the observed difference with the maximum across time of each
+    permutation, so they control the family-wise error rate of each
+    attribute over the whole time axis.
+    """
+
+    first: TDSCurve
+    second: TDSCurve
+    labels: Labels
+    alternative: str
+    n_permutations: int
+    difference: Float64Array
+    p_values: Float64Array
+    corrected_p_values: Float64Array
+
+    def draw(
+        self,
+        alpha: float = 0.05,
+        corrected: bool = True,
+        time_denominator: float = 1.0,
+        show: bool = True,
+        show_legend: bool = True,
+        curve_args: dict[str, Any] = {},
+        signif_args: dict[str, Any] = {},
+        legend_args: dict[str, Any] = {},
+        *,
+        fig: figure.Figure | None = None,
+    ) -> tuple[figure.Figure, plt.Axes]:
+        """# `tdbear.analyzer.PermutationTestResult.draw()`
+
+        Draws the difference curve of each attribute and marks
+        the time points where its p-value is below `alpha`,
+        on `fig` or on a new pyplot figure.
+        """
+
+        p_values: Float64Array = (
+            self.corrected_p_values if corrected else self.p_values
+        )
+        resolution: int = self.difference.shape[1]
+        time_ax: Float64Array = (
+            np.arange(1, resolution + 1) / resolution * time_denominator
+        )
+
+        if fig is None:
+            fig = pyplot().figure()
+
+        ax: plt.Axes = fig.add_subplot(
+            xlabel="Normalized Time",
+            ylabel="Difference of Dominance Proportion",
+        )
+
+        fig.suptitle(f"{self.first.name} - {self.second.name}")
+
+        for key in self.labels:
+            i: int = self.labels[key]
+            signif: np.ndarray = p_values[i] < alpha
+
+            line = ax.plot(time_ax, self.difference[i], **{"label": key, **curve_args})
+
+            ax.scatter(
+                time_ax[signif],
+                self.difference[i][signif],
+                **{"color": line[0].get_color(), "s": 4, **signif_args},
+            )
+
+        ax.axhline(0.0, color="gray", linestyle="dotted")
+
+        if show_legend:
+            ax.legend(**legend_args)
+
+        if show:
+            pyplot().show()
+
+        return (fig, ax)
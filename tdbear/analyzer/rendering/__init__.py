@@ -0,0 +1,3 @@
+from ..rendering.render_figures import render_figures
+
+__all__ = ["render_figures"]
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from typing import Callable, Hashable, Iterable, Any, TYPE_CHECKING
+import concurrent.futures
+import collections
+import functools
+import hashlib
+import os
+import re
+
+from ..._util import apply_fonts
+from ..curves import TDSCurve, TDSContainer
+
+if TYPE_CHECKING:
+    import matplotlib.figure as figure
+
+
+def render_figures(
+    tds_curves: Iterable[TDSCurve],
+    group_by: str | Callable[[TDSCurve], Hashable],
+    directory: str = ".",
+    *,
+    draw: Callable[[TDSContainer, figure.Figure], Any] | None = None,
+    draw_args: dict[str, Any] = {},
+    figure_args: dict[str, Any] = {},
+    savefig_args: dict[str, Any] = {},
+    file_extension: str = ".png",
+    workers: int | None = None,
+) -> dict[Hashable, str]:
+    """# `tdbear.analyzer.render_figures()`
+
+    Writes one image for each group of curves, without pyplot.
+    Each image is drawn on its own `matplotlib.figure.Figure`, saved
+    through the non-interactive Agg canvas and cleared right after,
+    so no figure is left open however many groups there are.
+
+    ## Args
+    - `tds_curves`     : Curves to draw, e.g. a `TDSContainer`.
+    - `group_by`       : A metadata key or a function of a curve,
+                         as in `TDSContainer.group_by()`.
+    - `directory`      : Directory of the images, created if it does not
+                         exist. Defaults to `"."`.
+    - `draw`           : A function drawing a group on the figure it is
+                         given. Defaults to `None`, which draws the merged
+                         curve of each group (`TDSCurve.draw()`) named
+                         after the group.
+    - `draw_args`      : Keyword arguments of `TDSCurve.draw()` when
+                         `draw` is `None`. Defaults to `{}`.
+    - `figure_args`    : Keyword arguments of `Figure()`
+                         (e.g. `figsize`, `dpi`). Defaults to `{}`.
+    - `savefig_args`   : Keyword arguments of `Figure.savefig()`.
+                         Defaults to `{}`.
+    - `file_extension` : File extension, which selects the image format.
+                         Defaults to `".png"`.
+    - `workers`        : Number of worker processes rendering images in
+                         parallel. Images are rendered serially if this is
+                         `None` or `1`. `draw` must be picklable when
+                         processes are used; with the default `draw`, only
+                         the merged curves are sent to them.
+                         Defaults to `None`.
+
+    ## Returns
+    - `dict[Hashable, str]` : Path of the image of each group. Groups
+                              whose file names would be the same
+                              (e.g. `"a/b"` and `"a b"`) get a short hash
+                              of their key appended to the name.
+
+    ## Examples
+    ```python
+    import tdbear.analyzer as ta
+
+    dataset = ta.load_dir("./nanakoberry/**/")
+    paths = ta.render_figures(
+        dataset,
+        lambda x: (x.get_meta("ASSESSOR"), x.get_meta("PRODUCT")),
+        "./figures",
+        workers=8,
+    )
+    ```
+    """
+
+    if not isinstance(tds_curves, TDSContainer):
+        tds_curves = TDSContainer(tds_curves)
+
+    os.makedirs(directory, exist_ok=True)
+
+    groups: dict[Hashable, TDSContainer] = tds_curves.group_by(group_by)
+    paths: dict[Hashable, str] = {
+        key: os.path.join(directory, name + file_extension)
+        for (key, name) in zip(groups, _file_names(groups))
+    }
+    targets: list[Any]
+
+    if draw is None:
+        # groups are merged here, so that workers receive one curve each
+        draw = functools.partial(_draw_merged, draw_args=draw_args)
+        targets = [group.merge_as(_name(key)) for (key, group) in groups.items()]
+    else:
+        targets = [*groups.values()]
+
+    render = functools.partial(
+        _render, draw=draw, figure_args=figure_args, savefig_args=savefig_args
+    )
+
+    if workers is None or workers <= 1 or len(targets) <= 1:
+        for _ in map(render, targets, paths.values()):
+            pass
+
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=apply_fonts
+        ) as executor:
+            for _ in executor.map(
+                render,
+                targets,
+                paths.values(),
+                chunksize=max(1, len(targets) // (workers * 4)),
+            ):
+                pass
+
+    return paths
+
+
+def _render(
+    target: Any,
+    path: str,
+    *,
+    draw: Callable[[Any, figure.Figure], Any],
+    figure_args: dict[str, Any],
+    savefig_args: dict[str, Any],
+) -> str:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    # the same fonts as figures drawn through pyplot
+    apply_fonts()
+
+    fig: figure.Figure = Figure(**figure_args)
+    FigureCanvasAgg(fig)
+
+    try:
+        draw(target, fig)
+        fig.savefig(path, **savefig_args)
+    finally:
+        fig.clear()
+
+    return path
+
+
+def _draw_merged(
+    curve: TDSCurve, fig: figure.Figure, *, draw_args: dict[str, Any]
+) -> None:
+    curve.draw(**{**draw_args, "show": False, "fig": fig})
+
+
+def _name(key: Hashable) -> str:
+    return " ".join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+
+def _file_name(key: Hashable) -> str:
+    # characters that are not allowed in file names on some systems
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", _name(key)) or "_"
+
+
+def _file_names(keys: Iterable[Hashable]) -> list[str]:
+    keys = [*keys]
+    names: list[str] = [*map(_file_name, keys)]
+    # file systems may ignore the case of names
+    counts: collections.Counter[str] = collections.Counter(map(str.casefold, names))
+
+    return [
+        (
+            f"{name}_{hashlib.sha1(repr(key).encode()).hexdigest()[:8]}"
+            if counts[name.casefold()] > 1
+            else name
+        )
+        for (key, name) in zip(keys, names)
+    ]
@@ -1,8 +1,22 @@
 """# `tdbear.sampler`
 """
 
+from typing import Any, TYPE_CHECKING
+
 from ..sampler.sampler_options import Options
-from ..sampler.sampler import run
+
+if TYPE_CHECKING:
+    from ..sampler.sampler import run
 
 
 __all__ = ["Options", "run"]
+
+
+def __getattr__(name: str) -> Any:
+    # PySimpleGUI (and tkinter) are imported on the first access to `run`
+    if name == "run":
+        from ..sampler.sampler import run
+
+        return run
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,73 @@
+"""Import of `tdbear.analyzer` must stay headless and fast.
+
+Each check runs in a fresh interpreter, since modules imported by
+other tests would already be in `sys.modules`.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+
+# seconds allowed for `import tdbear.analyzer`
+# (about 0.25 s when heavy dependencies are deferred, about 2 s otherwise)
+IMPORT_BUDGET: float = 1.0
+
+# modules that must be imported only when they are used
+HEAVY_MODULES: tuple[str, ...] = (
+    "matplotlib",
+    "matplotlib.pyplot",
+    "sklearn",
+    "scipy",
+    "PySimpleGUI",
+    "tkinter",
+)
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT: str = """
+import json, sys, time
+start = time.perf_counter()
+import tdbear.analyzer
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def run(*options: str) -> tuple[dict, str]:
+    process: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, *options, "-c", SCRIPT],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return (json.loads(process.stdout), process.stderr)
+
+
+def test_heavy_modules_are_not_imported():
+    (result, _) = run()
+    loaded: set[str] = {*result["modules"]}
+
+    assert not loaded & {*HEAVY_MODULES}
+
+
+def test_import_time_is_within_budget():
+    # the best of a few runs, so that a busy machine does not fail it
+    elapsed: float = min(run()[0]["elapsed"] for _ in range(3))
+
+    assert elapsed < IMPORT_BUDGET, f"import tdbear.analyzer took {elapsed:.2f} s"
+
+
+def test_importtime_report_has_no_heavy_modules():
+    (_, report) = run("-X", "importtime")
+    imported: set[str] = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in report.splitlines()
+        if line.startswith("import time:")
+    }
+
+    assert not imported & {*HEAVY_MODULES}
@@ -0,0 +1,65 @@
+"""Curves of sessions with different attribute words, made compatible
+by `TDSContainer.harmonize()`."""
+
+import numpy as np
+
+import tdbear.analyzer as ta
+
+
+RESOLUTION: int = 100
+
+
+def trial(data: dict, compact: bool = False) -> ta.TDSCurve:
+    return ta.TDSCurve.from_dict(
+        {"data": data, "duration": 1.0, "meta": {}}, RESOLUTION, compact=compact
+    )
+
+
+def sessions(compact: bool = False) -> ta.TDSContainer:
+    # "SOUR" and "SWEET" are each selected by one session only, and
+    # the second half of every trial selects one of them
+    return ta.TDSContainer(
+        [
+            trial({"FRUITY": [0.2], "SOUR": [0.5]}, compact),
+            trial({"FRUITY": [0.3], "SWEET": [0.5]}, compact),
+        ]
+    )
+
+
+def test_dropped_words_leave_zero_columns() -> None:
+    for compact in (False, True):
+        harmonized: ta.TDSContainer = sessions(compact).harmonize("intersection")
+
+        for curve in harmonized:
+            assert [*curve.attr_nums] == ["FRUITY"]
+            assert not curve.data[:, RESOLUTION // 2 :].any()
+
+        merged: ta.TDSCurve = harmonized.merge()
+
+        assert not np.isnan(merged.data).any()
+        assert not merged.data[:, RESOLUTION // 2 :].any()
+        assert np.allclose(merged.data[:, : RESOLUTION // 2].sum(0), 1.0)
+
+
+def test_dropped_words_on_other_merges() -> None:
+    harmonized: ta.TDSContainer = sessions().harmonize("intersection")
+    merged: ta.TDSCurve = harmonized.merge()
+
+    assert np.array_equal(harmonized.to_tensor().merge().data, merged.data)
+    assert not np.isnan(harmonized.to_tensor().fix().data).any()
+
+    accumulator: ta.TDSAccumulator = ta.TDSAccumulator()
+
+    for curve in harmonized:
+        accumulator.add(curve)
+
+    assert np.array_equal(accumulator.result().data, merged.data)
+
+
+def test_folded_words_keep_column_sums() -> None:
+    merged: ta.TDSCurve = (
+        sessions().harmonize("intersection", fold_into_delay=True).merge()
+    )
+
+    assert np.allclose(merged.data.sum(0), 1.0)
+    assert np.allclose(merged.data[-1, RESOLUTION // 2 :], 1.0)
@@ -0,0 +1,54 @@
+"""The line parser of `read_records()` must give the same result as
+`yaml.safe_load_all()`, handing anything it does not support to it."""
+
+import os
+
+import pytest
+import yaml
+
+from tdbear.analyzer.curves.tds_reader import read_records
+
+
+DATASET: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tdbear",
+    "analyzer",
+    "dataset",
+    "nanakoberry.yml",
+)
+
+HEADER: str = "meta:\n  ASSESSOR: [PA]\nduration: 1.5\ndata:\n"
+
+DOCUMENTS: dict[str, str] = {
+    "flow lists": HEADER + "  RED: [0.1, 0.7]\n  GREEN: []\n",
+    "block items": HEADER + "  RED:\n  - 0.1\n  - 0.7\n",
+    "indented block items": HEADER + "  RED:\n    - 0.1\n    - 0.7\n",
+    "deeper second item": HEADER + "  RED:\n  - 0.1\n    - 0.7\n",
+    "shallower second item": HEADER + "  RED:\n    - 0.1\n  - 0.7\n",
+    "items of two keys": HEADER + "  RED:\n   - 0.1\n  GREEN:\n  - 0.7\n",
+    "key without items": HEADER + "  GREEN:\n  RED: [0.1]\n",
+    "section without keys": "meta:\nduration: 1.5\ndata:\n  RED: [0.1]\n",
+    "key with trailing space": HEADER + "  RED : [0.1]\n",
+    "several documents": HEADER + "  RED: [0.1]\n---\n" + HEADER + "  RED: [0.2]\n",
+}
+
+
+def load(loader, text: str) -> tuple[str, object]:
+    try:
+        return ("ok", [*loader(text)])
+    except yaml.YAMLError as e:
+        return ("error", type(e).__name__)
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_same_as_yaml(name: str) -> None:
+    text: str = DOCUMENTS[name]
+
+    assert load(read_records, text) == load(yaml.safe_load_all, text)
+
+
+def test_dataset() -> None:
+    with open(DATASET, "r", encoding="UTF-8") as f:
+        text: str = f.read()
+
+    assert [*read_records(text)] == [*yaml.safe_load_all(text)]